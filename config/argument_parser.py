@@ -17,6 +17,21 @@ def parse_args():
         # Not required so it can fall back to the menu if not provided
     )
 
+    # Scan many repositories in one process
+    parser.add_argument(
+        "--batch",
+        type=str,
+        metavar="FILE",
+        help="Scan every repository URL listed in FILE (one per line) and report each contributor once",
+    )
+
+    # Scan every repository of an organization
+    parser.add_argument(
+        "--org",
+        type=str,
+        help="Scan every non-archived, non-fork repository of a GitHub organization",
+    )
+
     # Analyze commits at the repository level
     parser.add_argument(
         "-c",
@@ -54,6 +69,136 @@ def parse_args():
         "--csv", action="store_true", help="Export the results to a CSV file"
     )
 
+    # Fetch contributors, profiles and commit stats in bulk via GraphQL
+    parser.add_argument(
+        "--graphql",
+        action="store_true",
+        help="Fetch contributor profiles and commit history in bulk through the GitHub GraphQL API",
+    )
+
+    # Fetch contributors, profiles and commits concurrently with asyncio
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Fetch contributor pages, profiles and commit histories concurrently with asyncio",
+    )
+
+    # Where commit statistics come from
+    parser.add_argument(
+        "--backend",
+        choices=["api", "git"],
+        default="api",
+        help="Read commit statistics from the GitHub API (api) or from a local bare clone (git)",
+    )
+
+    # Only fetch commits newer than the previous run
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only fetch commits since the previous scan and merge them into the stored per-contributor totals",
+    )
+
+    # Number of concurrent GitHub workers
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Number of contributors or repositories fetched from GitHub concurrently; all workers share one rate-limit budget (default: 8)",
+    )
+
+    # Bypass the on-disk GitHub response cache
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the on-disk GitHub API response cache",
+    )
+
+    # Revalidate every cached GitHub response
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Revalidate every cached GitHub API response with a conditional request",
+    )
+
+    # Lifetime of cached GitHub responses
+    parser.add_argument(
+        "--cache-ttl",
+        type=int,
+        default=6 * 60 * 60,
+        help="Seconds a cached GitHub API response is used without revalidation (default: 21600)",
+    )
+
+    # Size cap of the GitHub response cache
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=512,
+        help="Maximum size of the GitHub API response cache in MB (default: 512)",
+    )
+
+    # Nameservers used for email domain MX lookups
+    parser.add_argument(
+        "--dns-server",
+        action="append",
+        metavar="ADDRESS",
+        help="Nameserver to query for MX records instead of the system resolvers (repeatable)",
+    )
+
+    # Port of the nameservers given with --dns-server
+    parser.add_argument(
+        "--dns-port",
+        type=int,
+        default=53,
+        help="Port of the nameservers used for MX lookups (default: 53)",
+    )
+
+    # Number of concurrent MX queries
+    parser.add_argument(
+        "--dns-concurrency",
+        type=int,
+        default=64,
+        help="Maximum number of MX queries in flight at once (default: 64)",
+    )
+
+    # Timeout of one MX query
+    parser.add_argument(
+        "--dns-timeout",
+        type=float,
+        default=5.0,
+        help="Seconds allowed for one MX lookup (default: 5)",
+    )
+
+    # Fall back to LocationIQ for profile locations missing from the gazetteer
+    parser.add_argument(
+        "--geocode",
+        action="store_true",
+        help="Geocode profile locations the gazetteer cannot resolve with LocationIQ",
+    )
+
+    # Request budget of the LocationIQ account
+    parser.add_argument(
+        "--geocode-rate",
+        type=float,
+        default=2.0,
+        help="Maximum LocationIQ requests per second (default: 2, the free tier limit)",
+    )
+
+    # Messages per BERT forward pass
+    parser.add_argument(
+        "--embedding-batch-size",
+        type=int,
+        default=32,
+        help="Number of commit messages embedded per BERT forward pass (default: 32)",
+    )
+
+    # CPU threads used by torch
+    parser.add_argument(
+        "--torch-threads",
+        type=int,
+        help="Number of CPU threads torch uses for BERT inference (default: torch's own choice)",
+    )
+
     # Check GitHub and LocationIQ API rate limits
     parser.add_argument(
         "--rate-limit",
@@ -0,0 +1,158 @@
+import os
+import re
+import json
+import hashlib
+import logging
+import threading
+import numpy as np
+from utils.cache import CACHE_DIR
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+EMBEDDING_STORE_DIR = os.path.join(CACHE_DIR, "embeddings")
+
+
+def message_hash(text):
+    """
+    Content hash of a message, the key of its stored embedding.
+    """
+    encoded = text.encode("utf-8", "surrogatepass")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+class EmbeddingStore:
+    """
+    Append-only on-disk store of embedding vectors keyed by message hash.
+
+    Vectors are rows of one raw float32 (or float16) matrix file that is
+    read through np.memmap, so stored vectors are views of the page cache
+    rather than copies. The index file lists one message hash per row, in
+    row order, and is only appended to after the rows it names have been
+    written; a torn write is truncated away on the next open. Every model
+    name and version gets its own directory, so vectors of different
+    models never mix.
+    """
+
+    def __init__(self, model_name, model_version, dim, dtype=np.float32, path=None):
+        self.model_name = model_name
+        self.model_version = model_version
+        self.dim = dim
+        self.dtype = np.dtype(dtype)
+        tag = re.sub(r"[^\w.-]+", "_", f"{model_name}-{model_version}-{self.dtype}")
+        self.path = path or os.path.join(EMBEDDING_STORE_DIR, tag)
+        self.vectors_path = os.path.join(self.path, "vectors.bin")
+        self.index_path = os.path.join(self.path, "index.txt")
+        self._rows = {}
+        self._matrix = None
+        self._lock = threading.Lock()
+        os.makedirs(self.path, exist_ok=True)
+        self._write_meta()
+        self._load_index()
+
+    def _write_meta(self):
+        meta_path = os.path.join(self.path, "meta.json")
+        meta = {
+            "model": self.model_name,
+            "version": self.model_version,
+            "dim": self.dim,
+            "dtype": str(self.dtype),
+        }
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                stored = json.load(f)
+            if stored != meta:
+                raise ValueError(
+                    f"Embedding store {self.path} holds {stored}, not {meta}"
+                )
+            return
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    def _load_index(self):
+        row_bytes = self.dim * self.dtype.itemsize
+        hashes = []
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="ascii") as f:
+                hashes = [line.strip() for line in f if line.endswith("\n")]
+        vector_bytes = (
+            os.path.getsize(self.vectors_path)
+            if os.path.exists(self.vectors_path)
+            else 0
+        )
+        rows = min(vector_bytes // row_bytes, len(hashes))
+        if len(hashes) != rows or vector_bytes != rows * row_bytes:
+            logger.warning(f"Truncating embedding store {self.path} to {rows} rows")
+            self._truncate(rows, hashes[:rows])
+        self._rows = {h: row for row, h in enumerate(hashes[:rows])}
+        logger.debug(f"Opened embedding store {self.path} with {rows} vectors")
+
+    def _truncate(self, rows, hashes):
+        with open(self.vectors_path, "ab") as f:
+            f.truncate(rows * self.dim * self.dtype.itemsize)
+        with open(self.index_path, "w", encoding="ascii") as f:
+            f.writelines(f"{h}\n" for h in hashes)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, key):
+        return key in self._rows
+
+    @property
+    def matrix(self):
+        """
+        Read-only memory-mapped view of every stored vector.
+        """
+        with self._lock:
+            rows = len(self._rows)
+            if self._matrix is None or len(self._matrix) != rows:
+                if rows == 0:
+                    return np.empty((0, self.dim), dtype=self.dtype)
+                self._matrix = np.memmap(
+                    self.vectors_path,
+                    dtype=self.dtype,
+                    mode="r",
+                    shape=(rows, self.dim),
+                )
+            return self._matrix
+
+    def get(self, key):
+        """
+        Return the stored vector of message hash `key` as a view into the
+        memory map, or None.
+        """
+        row = self._rows.get(key)
+        if row is None:
+            return None
+        return self.matrix[row]
+
+    def rows(self, keys):
+        """
+        Returns:
+            dict: Message hash to row number, for the stored keys among `keys`.
+        """
+        return {key: self._rows[key] for key in keys if key in self._rows}
+
+    def add(self, keys, vectors):
+        """
+        Append the vectors of new message hashes; keys already stored are
+        skipped.
+        """
+        keys = list(keys)
+        vectors = np.asarray(vectors, dtype=self.dtype).reshape(-1, self.dim)
+        positions = {key: i for i, key in enumerate(keys)}
+        with self._lock:
+            new = [key for key in positions if key not in self._rows]
+            if not new:
+                return
+            block = vectors[[positions[key] for key in new]]
+            # Rows first, then the index naming them
+            with open(self.vectors_path, "ab") as f:
+                f.write(block.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            with open(self.index_path, "a", encoding="ascii") as f:
+                f.writelines(f"{key}\n" for key in new)
+            for key in new:
+                self._rows[key] = len(self._rows)
@@ -1,15 +1,108 @@
-from transformers import BertTokenizer, BertModel
+from transformers import BertTokenizerFast, BertModel
+import transformers
+import numpy as np
 import torch
+from modules.embedding_store import EmbeddingStore, message_hash
+
+BERT_MODEL_NAME = "bert-base-uncased"
+MAX_LENGTH = 128
+# Messages per forward pass in get_bert_embeddings_batch
+EMBEDDING_BATCH_SIZE = 32
+
 
 class Embeddings:
-    def __init__(self):
-        self.tokenizer = BertTokenizer.from_pretrained("bert-base-uncased")
-        self.bert_model = BertModel.from_pretrained("bert-base-uncased")
+    def __init__(self, batch_size=EMBEDDING_BATCH_SIZE, num_threads=None):
+        self.tokenizer = BertTokenizerFast.from_pretrained(BERT_MODEL_NAME)
+        self.bert_model = BertModel.from_pretrained(BERT_MODEL_NAME)
+        self.bert_model.eval()
+        self.batch_size = batch_size
+        self._store = None
+        if num_threads:
+            torch.set_num_threads(num_threads)
+
+    @property
+    def store(self):
+        # Vectors depend on the weights and the truncation length
+        if self._store is None:
+            config = self.bert_model.config
+            revision = (
+                getattr(config, "_commit_hash", None) or transformers.__version__
+            )
+            self._store = EmbeddingStore(
+                BERT_MODEL_NAME, f"{revision}-{MAX_LENGTH}", config.hidden_size
+            )
+        return self._store
 
     def get_bert_embeddings(self, text):
         inputs = self.tokenizer(
-            text, return_tensors="pt", truncation=True, padding=True, max_length=128
+            text,
+            return_tensors="pt",
+            truncation=True,
+            padding=True,
+            max_length=MAX_LENGTH,
         )
-        with torch.no_grad():
+        with torch.inference_mode():
             outputs = self.bert_model(**inputs)
         return outputs.last_hidden_state.mean(dim=1).squeeze()
+
+    def get_bert_embeddings_batch(self, texts, batch_size=None):
+        """
+        Embed many texts at once: mean-pooled last hidden states, one row per
+        text in input order.
+
+        Texts are sorted by token length and batched, so each batch is only
+        padded to its own longest text and little compute goes to padding.
+        Padding is masked out of the mean, so every row equals what
+        get_bert_embeddings returns for that text alone.
+        """
+        texts = list(texts)
+        batch_size = batch_size or self.batch_size
+        hidden_size = self.bert_model.config.hidden_size
+        vectors = np.empty((len(texts), hidden_size), dtype=np.float32)
+        if not texts:
+            return vectors
+
+        encodings = self.tokenizer(
+            texts, truncation=True, max_length=MAX_LENGTH, padding=False
+        )["input_ids"]
+        order = sorted(range(len(texts)), key=lambda i: len(encodings[i]))
+
+        with torch.inference_mode():
+            for start in range(0, len(order), batch_size):
+                batch = order[start : start + batch_size]
+                inputs = self.tokenizer.pad(
+                    {"input_ids": [encodings[i] for i in batch]}, return_tensors="pt"
+                )
+                outputs = self.bert_model(**inputs)
+                mask = inputs["attention_mask"].unsqueeze(-1).to(
+                    outputs.last_hidden_state.dtype
+                )
+                summed = (outputs.last_hidden_state * mask).sum(dim=1)
+                vectors[batch] = (summed / mask.sum(dim=1)).numpy()
+        return vectors
+
+    def embed_messages(self, texts):
+        """
+        Embed messages through the on-disk embedding store: only messages
+        whose hash is not stored yet reach the model, and their vectors are
+        appended to the store.
+
+        Returns:
+            numpy.ndarray: One row per text, in input order. When the texts
+            are stored in one contiguous run, as on a re-scan of the same
+            history, the result is a zero-copy slice of the memory map.
+        """
+        texts = list(texts)
+        store = self.store
+        keys = [message_hash(text) for text in texts]
+        missing = {key: text for key, text in zip(keys, texts) if key not in store}
+        if missing:
+            vectors = self.get_bert_embeddings_batch(missing.values())
+            store.add(missing.keys(), vectors)
+
+        rows = store.rows(keys)
+        indices = np.array([rows[key] for key in keys], dtype=np.int64)
+        matrix = store.matrix
+        if len(indices) and np.all(np.diff(indices) == 1):
+            return matrix[indices[0] : indices[-1] + 1]
+        return matrix[indices]
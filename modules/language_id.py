@@ -0,0 +1,140 @@
+import threading
+import unicodedata
+from collections import Counter, OrderedDict
+from langdetect import DetectorFactory, LangDetectException, detect
+from modules.embedding_store import message_hash
+
+# langdetect samples at random; a fixed seed makes it deterministic
+LANGDETECT_SEED = 0
+DetectorFactory.seed = LANGDETECT_SEED
+
+# Plain ASCII messages shorter than this are taken as English without
+# asking langdetect, which is unreliable on a few words anyway
+MIN_DETECT_WORDS = 4
+
+# Detected languages kept in memory, keyed by message hash
+LANGUAGE_CACHE_SIZE = 100000
+
+# One CJK character carries about as much as a short Latin word
+CJK_WEIGHT = 3
+
+# Share of (weighted) letters a non-Latin script needs to decide the
+# language; mixed messages like "修复 bug in parser" are not English
+NON_LATIN_MIN_SHARE = 0.2
+
+# (first code point, last code point, script); code points outside these
+# ranges that are letters count as Latin
+SCRIPT_RANGES = [
+    (0x0370, 0x03FF, "el"),
+    (0x0400, 0x052F, "ru"),
+    (0x0590, 0x05FF, "he"),
+    (0x0600, 0x06FF, "ar"),
+    (0x0750, 0x077F, "ar"),
+    (0x0900, 0x097F, "hi"),
+    (0x0E00, 0x0E7F, "th"),
+    (0x1100, 0x11FF, "ko"),
+    (0x3040, 0x30FF, "ja"),
+    (0x3130, 0x318F, "ko"),
+    (0x3400, 0x4DBF, "zh"),
+    (0x4E00, 0x9FFF, "zh"),
+    (0xAC00, 0xD7AF, "ko"),
+    (0xF900, 0xFAFF, "zh"),
+    (0x20000, 0x2A6DF, "zh"),
+]
+
+_CJK = {"zh", "ja", "ko"}
+
+_language_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _char_script(char):
+    code = ord(char)
+    for first, last, script in SCRIPT_RANGES:
+        if first <= code <= last:
+            return script
+    return "latin"
+
+
+def script_language(text):
+    """
+    Classify `text` by the Unicode scripts of its letters.
+
+    Returns:
+        str: A language code when the dominant script identifies the language
+        (Han -> "zh", kana -> "ja", Hangul -> "ko", Cyrillic -> "ru", ...),
+        "latin" for Latin-script text, or None for text without letters.
+    """
+    if text.isascii():
+        return "latin" if any(char.isalpha() for char in text) else None
+    counts = Counter()
+    for char in text:
+        if char.isalpha():
+            script = _char_script(char)
+            counts[script] += CJK_WEIGHT if script in _CJK else 1
+    if not counts:
+        return None
+    # Japanese mixes kana with Han characters
+    if counts["ja"] and counts["zh"]:
+        counts["ja"] += counts.pop("zh")
+    latin = counts.pop("latin", 0)
+    if counts:
+        script, count = counts.most_common(1)[0]
+        if count >= NON_LATIN_MIN_SHARE * (count + latin):
+            return script
+    return "latin"
+
+
+def _detect_uncached(text):
+    if text.lower() in ["initial commit", "first commit"]:
+        return "en"
+    script = script_language(text)
+    if script is None:
+        # No letters to go on (e.g. "1.2.3"); the English pipeline copes best
+        return "en"
+    if script != "latin":
+        return script
+    if text.isascii() and len(text.split()) < MIN_DETECT_WORDS:
+        return "en"
+    try:
+        language = detect(text)
+    except LangDetectException:
+        return "en"
+    # langdetect reports Chinese as zh-cn/zh-tw
+    return language.split("-")[0]
+
+
+def detect_language(text):
+    """
+    Identify the language of a commit message: by script where that
+    settles it, otherwise with seeded langdetect. Results are cached by
+    message hash.
+
+    Returns:
+        str: An ISO 639-1 code such as "en", "zh" or "ru".
+    """
+    key = message_hash(text)
+    with _cache_lock:
+        language = _language_cache.get(key)
+        if language is not None:
+            _language_cache.move_to_end(key)
+            return language
+    language = _detect_uncached(unicodedata.normalize("NFC", text))
+    with _cache_lock:
+        _language_cache[key] = language
+        while len(_language_cache) > LANGUAGE_CACHE_SIZE:
+            _language_cache.popitem(last=False)
+    return language
+
+
+def detect_languages(texts):
+    """
+    Identify the language of many messages, detecting each distinct
+    message once.
+
+    Returns:
+        list: Language codes in input order.
+    """
+    texts = list(texts)
+    languages = {text: detect_language(text) for text in dict.fromkeys(texts)}
+    return [languages[text] for text in texts]
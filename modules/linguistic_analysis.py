@@ -1,30 +1,55 @@
 import logging
-from modules.embeddings import Embeddings
-from modules.syntax_analysis import SyntaxAnalyzer
+from modules.model_registry import get_model
+from modules.syntax_analysis import SYNTAX_BATCH_SIZE, SyntaxAnalyzer
 from modules.feature_extraction import FeatureExtractor
 
 class LinguisticAnalysis:
     def __init__(self):
-        self.embeddings = Embeddings()
         self.syntax_analyzer = SyntaxAnalyzer()
         self.feature_extractor = FeatureExtractor()
 
+    @property
+    def embeddings(self):
+        # BERT is shared process-wide and only loaded when embeddings are used
+        return get_model("bert")
+
+    def analyze_syntax(self, text):
+        return self.syntax_analyzer.analyze_syntax(text)
+
+    def analyze_syntax_many(self, texts, batch_size=SYNTAX_BATCH_SIZE, n_process=1):
+        return self.syntax_analyzer.analyze_syntax_many(
+            texts, batch_size=batch_size, n_process=n_process
+        )
+
+    def extract_ngrams(self, text, n=2):
+        return self.feature_extractor.extract_ngrams(text, n=n)
+
+    def extract_code_patterns(self, text):
+        return self.feature_extractor.extract_code_patterns(text)
+
     def classify_text(self, text):
-        # Generate embeddings
-        embeddings = self.embeddings.get_bert_embeddings(text).numpy().reshape(1, -1)
+        return self.classify_texts([text])[0]
 
-        # Analyze syntax
-        syntax_features = self.syntax_analyzer.analyze_syntax(text)
+    def classify_texts(self, texts):
+        texts = list(texts)
+        # Generate embeddings in length-bucketed batches, reading through the
+        # on-disk embedding store
+        embeddings = self.embeddings.embed_messages(texts)
 
-        # Combine features for classification
-        combined_features = list(embeddings[0]) + [
-            len(syntax_features["Missing_Articles"]),
-            len(syntax_features["Subject-Verb_Agreement"]),
-            syntax_features["Repetitive_Phrases"],
-            syntax_features["Complex_Sentences"],
-        ]
+        # Analyze syntax
+        syntax_results = self.analyze_syntax_many(texts)
 
-        return self.identify_origin_from_syntax(syntax_features)
+        results = []
+        for embedding, syntax_features in zip(embeddings, syntax_results):
+            # Combine features for classification
+            combined_features = list(embedding) + [
+                len(syntax_features["Missing_Articles"]),
+                len(syntax_features["Subject-Verb_Agreement"]),
+                syntax_features["Repetitive_Phrases"],
+                syntax_features["Complex_Sentences"],
+            ]
+            results.append(self.identify_origin_from_syntax(syntax_features))
+        return results
 
     def identify_origin_from_syntax(self, syntax_results):
         score = 0
@@ -0,0 +1,115 @@
+import os
+import time
+import logging
+import resource
+import threading
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# spaCy components no analyzer reads; excluding them speeds up every parse
+SPACY_EXCLUDE = ["ner", "lemmatizer"]
+
+_loaders = {}
+_models = {}
+_model_stats = {}
+_registry_lock = threading.RLock()
+
+# Keyword arguments for Embeddings; override with configure_bert
+_bert_settings = {}
+
+
+def register_model(name, loader):
+    """
+    Register a zero-argument `loader` that builds the model called `name`.
+    Nothing is loaded until get_model(name) is first called.
+    """
+    with _registry_lock:
+        _loaders[name] = loader
+
+
+def _rss_bytes():
+    """
+    Current resident set size of the process, or its peak where the current
+    value is not available.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+        return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+def get_model(name):
+    """
+    Return the model called `name`, loading it on first use. Every consumer
+    in the process shares the same instance.
+    """
+    model = _models.get(name)
+    if model is not None:
+        return model
+    with _registry_lock:
+        if name not in _models:
+            if name not in _loaders:
+                raise KeyError(f"No model registered as '{name}'")
+            rss_before = _rss_bytes()
+            started = time.perf_counter()
+            _models[name] = _loaders[name]()
+            _model_stats[name] = {
+                "load_seconds": time.perf_counter() - started,
+                "rss_bytes": max(_rss_bytes() - rss_before, 0),
+            }
+            logger.debug(
+                f"Loaded model '{name}' in {_model_stats[name]['load_seconds']:.2f}s "
+                f"(+{_model_stats[name]['rss_bytes'] / 2**20:.0f} MB resident)"
+            )
+        return _models[name]
+
+
+def is_model_loaded(name):
+    return name in _models
+
+
+def model_stats():
+    """
+    Returns:
+        dict: Name of every loaded model to its load time in seconds and the
+        growth of resident memory while it loaded, in bytes.
+    """
+    with _registry_lock:
+        return {name: dict(stats) for name, stats in _model_stats.items()}
+
+
+def configure_bert(batch_size=None, num_threads=None):
+    """
+    Configure the BERT model before it is first loaded.
+
+    Args:
+        batch_size (int): Messages embedded per forward pass.
+        num_threads (int): Threads torch uses for CPU inference.
+    """
+    if batch_size is not None:
+        _bert_settings["batch_size"] = batch_size
+    if num_threads is not None:
+        _bert_settings["num_threads"] = num_threads
+    if is_model_loaded("bert"):
+        logger.warning("BERT is already loaded; new settings apply from the next run")
+
+
+def _load_bert():
+    from modules.embeddings import Embeddings
+
+    return Embeddings(**_bert_settings)
+
+
+def _load_spacy(package):
+    import spacy
+
+    return spacy.load(package, exclude=SPACY_EXCLUDE)
+
+
+register_model("bert", _load_bert)
+register_model("spacy_en", lambda: _load_spacy("en_core_web_sm"))
+register_model("spacy_zh", lambda: _load_spacy("zh_core_web_sm"))
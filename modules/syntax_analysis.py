@@ -1,19 +1,60 @@
-import spacy
 import re
-from langdetect import detect
+from modules.language_id import detect_language, detect_languages
+from modules.model_registry import get_model
+
+# Messages per nlp.pipe batch in analyze_syntax_many
+SYNTAX_BATCH_SIZE = 256
+
+# Size of the first batch when streaming, so early results are not held back
+SYNTAX_FIRST_BATCH_SIZE = 8
 
 class SyntaxAnalyzer:
-    def __init__(self):
-        self.nlp_en = spacy.load("en_core_web_sm")
-        self.nlp_zh = spacy.load("zh_core_web_sm")
+    # The spaCy pipelines are shared process-wide and loaded on first use
+    @property
+    def nlp_en(self):
+        return get_model("spacy_en")
+
+    @property
+    def nlp_zh(self):
+        return get_model("spacy_zh")
 
     def analyze_syntax(self, text):
         # Detect the language of the text
-        language = "en" if text.lower() in ["initial commit", "first commit"] else detect(text)
+        language = detect_language(text)
 
         # Load the appropriate spaCy model based on language
         doc = self.nlp_zh(text) if language == "zh" else self.nlp_en(text)
+        return self._syntax_features(doc, text, language)
+
+    def analyze_syntax_many(self, texts, batch_size=SYNTAX_BATCH_SIZE, n_process=1):
+        """
+        Batch version of analyze_syntax: returns its feature dict for every
+        text, in input order.
+
+        Texts are grouped by detected language and streamed through that
+        language's pipeline with nlp.pipe. n_process > 1 parses in worker
+        processes, which only pays off for thousands of messages.
+        """
+        texts = list(texts)
+        by_language = {}
+        for i, language in enumerate(detect_languages(texts)):
+            by_language.setdefault("zh" if language == "zh" else "en", []).append(
+                (i, language)
+            )
+
+        results = [None] * len(texts)
+        for pipeline, items in by_language.items():
+            nlp = self.nlp_zh if pipeline == "zh" else self.nlp_en
+            docs = nlp.pipe(
+                (texts[i] for i, _ in items),
+                batch_size=batch_size,
+                n_process=n_process,
+            )
+            for (i, language), doc in zip(items, docs):
+                results[i] = self._syntax_features(doc, texts[i], language)
+        return results
 
+    def _syntax_features(self, doc, text, language):
         syntax_features = {
             "POS_tags": [token.pos_ for token in doc],
             "Dependency_tags": [token.dep_ for token in doc],
@@ -7,9 +7,15 @@ from config.argument_parser import parse_args, configure_logging
 from config.setup_nltk import setup_nltk_data
 from utils.cli import OriginCLI
 from utils.menu import display_main_menu
-from provenance.commit import analyze_commits
-
-# Initialize engines
+from provenance.commit import analyze_commits, with_syntax_results
+from provenance import batch
+from services.github_client import configure_http_cache
+from services.email_service import configure_dns, email_domain
+from services.location_service import configure_geocoding
+from services.domain_classifier import classify_domain
+from modules.model_registry import configure_bert
+
+# Initialize engines; their NLP models load on first use
 linguistic_analyzer = LinguisticAnalysis()
 devtools_analyzer = DevToolsAnalysis()
 
@@ -30,12 +36,12 @@ def detect_contributor_origin(contributor_info, commit_messages):
     if country_from_metadata:
         return country_from_metadata
 
-    # Fallback: Perform linguistic analysis on commit messages
-    for message in commit_messages:
+    # Fallback: Perform linguistic analysis on commit messages, parsed in batches
+    for message, syntax_results in with_syntax_results(
+        commit_messages, message=lambda message: message
+    ):
         logging.info(f"Analyzing commit message: {message}")
 
-        # Perform linguistic analysis
-        syntax_results = linguistic_analyzer.analyze_syntax(message)
         likely_origin = linguistic_analyzer.identify_origin_from_syntax(syntax_results)
 
         if likely_origin != "Unknown":
@@ -54,11 +60,12 @@ def detect_origin_from_metadata(contributor_info):
     Returns:
         str or None: Detected origin or None if no match.
     """
-    email = contributor_info.get("email", "")
-    organization = contributor_info.get("organization", "")
+    email = contributor_info.get("email") or ""
+    organization = contributor_info.get("organization") or ""
 
-    if email.endswith(".cn"):
-        return "China"
+    country = classify_domain(email_domain(email)) if "@" in email else None
+    if country:
+        return country
     elif organization.lower() == "russian dev group":
         return "Russia"
     return None
@@ -90,10 +97,40 @@ def main():
     args = parse_args()
     configure_logging(args.verbose)
     setup_nltk_data(force_download=args.update_nltk)
+    configure_http_cache(
+        enabled=not args.no_cache,
+        refresh=args.refresh,
+        ttl=args.cache_ttl,
+        max_bytes=args.cache_size * 1024 * 1024,
+    )
+    configure_dns(
+        nameservers=args.dns_server,
+        port=args.dns_port,
+        concurrency=args.dns_concurrency,
+        timeout=args.dns_timeout,
+    )
+    configure_geocoding(
+        enabled=args.geocode, requests_per_second=args.geocode_rate
+    )
+    configure_bert(
+        batch_size=args.embedding_batch_size, num_threads=args.torch_threads
+    )
 
     try:
         # Command-line mode
-        if args.commit_analysis:
+        if args.batch or args.org:
+            logging.info("Running batch provenance analysis...")
+            if args.batch:
+                repo_urls = batch.load_repository_list(args.batch)
+            else:
+                repo_urls = batch.list_organization_repositories(args.org)
+            report = batch.scan_repositories(
+                repo_urls, max_workers=args.workers, verbose=args.verbose >= 3
+            )
+            batch.print_batch_report(report, adversarial_only=args.adversarial)
+            if args.csv:
+                batch.write_batch_report_csv(report, "batch_report.csv")
+        elif args.commit_analysis:
             logging.info("Running commit analysis...")
             owner, repo_name = args.repo_url.split("/")[-2:]
             analyze_commits(
@@ -102,6 +139,12 @@ def main():
                 contributor=args.contributor,
                 show_code=args.show_code,
                 enable_commit_analysis=True,
+                use_graphql=args.graphql,
+                use_async=args.use_async,
+                incremental=args.incremental,
+                backend=args.backend,
+                repo_location=args.repo_url,
+                max_workers=args.workers,
             )
         elif args.adversarial:
             logging.info("Running adversarial analysis...")
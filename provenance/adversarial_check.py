@@ -1,5 +1,8 @@
 from tqdm import tqdm
 from provenance.geography import identify_geography
+from services.profile_service import contributor_login, resolve_profiles
+from services.email_service import prefetch_domain_locations
+from provenance.normalize_place import normalize_places
 
 # List of adversarial or banned countries
 BANNED_COUNTRIES = ["China", "Iran", "North Korea", "Cuba", "Venezuela", "Russia"]
@@ -14,13 +17,27 @@ def run_adversarial_analysis(
     # Normalize banned countries for comparison
     banned_countries_normalized = [country.lower() for country in BANNED_COUNTRIES]
 
+    # Resolve every uncached profile up front in batched requests
+    logins = [contributor_login(contributor) for contributor in contributors]
+    profiles = resolve_profiles(logins)
+    prefetch_domain_locations(p.get("email") for p in profiles.values())
+    places = normalize_places(p.get("location") for p in profiles.values())
+
     # Analyze each contributor
-    for contributor in tqdm(contributors, desc="Analyzing contributors"):
-        geography = identify_geography(contributor, city_country_dict, verbose=verbose)
+    for login in tqdm(logins, desc="Analyzing contributors"):
+        profile = profiles.get(login, login)
+        geography = identify_geography(
+            profile,
+            city_country_dict,
+            verbose=verbose,
+            normalized_place=places.get(profile.get("location"))
+            if isinstance(profile, dict)
+            else None,
+        )
         final_location = geography["final_location"].strip().lower()
 
         # Check if the contributor's location is in the list of banned countries
         if final_location in banned_countries_normalized:
             # Only print contributor and final location without extra info
-            tqdm.write(f"Contributor: {contributor.login}")
+            tqdm.write(f"Contributor: {login}")
             tqdm.write(f"  Final Location: {geography['final_location']}")
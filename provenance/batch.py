@@ -0,0 +1,161 @@
+import csv
+import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from tqdm import tqdm
+from provenance.adversarial_check import BANNED_COUNTRIES
+from provenance.commit import parse_repo_url
+from provenance.geography import identify_geography_dict
+from services.github_client import github_client, fetch_contributor_logins
+from services.profile_service import resolve_profiles
+from services.email_service import prefetch_domain_locations
+from provenance.normalize_place import normalize_places
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_WORKERS = 8
+
+
+def load_repository_list(file_path):
+    """
+    Read repository URLs from a file, one per line. Blank lines and lines
+    starting with '#' are ignored.
+    """
+    with open(file_path, encoding="utf-8") as f:
+        return [
+            line.strip()
+            for line in f
+            if line.strip() and not line.strip().startswith("#")
+        ]
+
+
+def list_organization_repositories(org_name, include_forks=False):
+    """
+    List the URLs of an organization's repositories, skipping archived ones
+    and, unless requested, forks.
+    """
+    g = github_client()
+    repos = g.get_organization(org_name).get_repos()
+    return [
+        repo.html_url
+        for repo in repos
+        if not repo.archived and (include_forks or not repo.fork)
+    ]
+
+
+def scan_repositories(
+    repo_urls,
+    city_country_dict=None,
+    max_workers=DEFAULT_BATCH_WORKERS,
+    verbose=False,
+):
+    """
+    Scan many repositories in one process and report each person once.
+
+    Contributor lists are fetched concurrently, contributors are deduplicated
+    across repositories, every unique profile is resolved in shared batches,
+    and geography is computed once per person.
+
+    Returns:
+        list: One dict per person with login, repos and geography.
+    """
+    repos_by_login = defaultdict(set)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(fetch_contributor_logins, *parse_repo_url(url)): url
+            for url in repo_urls
+        }
+        for future in tqdm(
+            as_completed(futures),
+            total=len(futures),
+            desc="Listing contributors",
+            unit="repo",
+            colour="green",
+        ):
+            url = futures[future]
+            try:
+                logins = future.result()
+            except Exception as e:
+                logger.error(f"Error listing contributors of {url}: {e}")
+                continue
+            owner, repo_name = parse_repo_url(url)
+            for login in logins:
+                repos_by_login[login].add(f"{owner}/{repo_name}")
+
+    logins = sorted(repos_by_login)
+    tqdm.write(
+        f"Found {len(logins)} unique contributors across {len(repo_urls)} repositories"
+    )
+    profiles = resolve_profiles(logins)
+    prefetch_domain_locations(p.get("email") for p in profiles.values())
+    places = normalize_places(p.get("location") for p in profiles.values())
+
+    report = []
+    for login in tqdm(logins, desc="Analyzing contributors", unit="contributor"):
+        profile = profiles.get(login, {"login": login})
+        geography = identify_geography_dict(
+            profile,
+            city_country_dict,
+            verbose=verbose,
+            normalized_place=places.get(profile.get("location")),
+        )
+        report.append(
+            {
+                "login": login,
+                "repos": sorted(repos_by_login[login]),
+                "geography": geography,
+            }
+        )
+    return report
+
+
+def print_batch_report(report, adversarial_only=False):
+    """
+    Print the combined per-person report, optionally only people located in
+    adversarial countries.
+    """
+    banned = {country.lower() for country in BANNED_COUNTRIES}
+    for person in report:
+        geography = person["geography"]
+        if adversarial_only and geography["final_location"].lower() not in banned:
+            continue
+        print(f"Contributor: {person['login']}")
+        print(f"  Repositories ({len(person['repos'])}): {', '.join(person['repos'])}")
+        print(f"  Email-based Location: {geography['email_geo']}")
+        print(f"  Profile Location: {geography['profile_geo']}")
+        print(
+            f"  Final Location: {geography['final_location']} with {geography['confidence']:.2f}% confidence\n"
+        )
+
+
+def write_batch_report_csv(report, file_path):
+    """
+    Export the combined per-person report to a CSV file.
+    """
+    with open(file_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(
+            [
+                "login",
+                "repositories",
+                "email_geo",
+                "profile_geo",
+                "final_location",
+                "confidence",
+            ]
+        )
+        for person in report:
+            geography = person["geography"]
+            writer.writerow(
+                [
+                    person["login"],
+                    ";".join(person["repos"]),
+                    geography["email_geo"],
+                    geography["profile_geo"],
+                    geography["final_location"],
+                    f"{geography['confidence']:.2f}",
+                ]
+            )
+    logger.info(f"Batch report written to {file_path}")
@@ -1,108 +1,268 @@
-from collections import defaultdict
 import logging
+import itertools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm
 import github
-from services.github_client import github_client
+from services.github_client import (
+    github_client,
+    token_pool,
+    fetch_commit_history,
+    fetch_user_profiles,
+)
+from services.async_github_client import fetch_repository, iter_commit_histories
+from services.profile_service import contributor_login, get_cached_profiles
+from services.git_backend import (
+    clone_repository,
+    iter_git_commits,
+    iter_contributor_commits,
+    contributor_key,
+)
+from provenance.commit_state import (
+    new_commit_aggregate,
+    add_commit_to_aggregate,
+    committed_date,
+    summarize_commit_aggregate,
+    new_commit_filter,
+    load_commit_aggregate,
+    save_commit_aggregate,
+    load_repository_mark,
+    save_repository_mark,
+)
 from modules.linguistic_analysis import LinguisticAnalysis
+from modules.syntax_analysis import SYNTAX_BATCH_SIZE, SYNTAX_FIRST_BATCH_SIZE
 from colorama import Fore, Style
 
-# Initialize linguistic analysis engine
+# Initialize linguistic analysis engine; its NLP models load on first use
 linguistic_analyzer = LinguisticAnalysis()
 
+# Contributors whose commits are fetched at once; they share token_pool's budget
+COMMIT_FETCH_WORKERS = 8
 
-# Fetch commits for a contributor with error handling and rate limit checking
-def fetch_commits(repo, contributor, show_code=False):
+
+def commit_record(commit):
+    """
+    Normalize a commit into the record dict used by the analysis code.
+    Records coming from the GraphQL fetcher are returned unchanged; PyGithub
+    Commit objects are converted (accessing `stats` may cost a request).
+    """
+    if isinstance(commit, dict):
+        return commit
+    stats = commit.stats
+    return {
+        "sha": commit.sha,
+        "message": commit.commit.message,
+        "date": commit.commit.author.date,
+        "committed_date": commit.commit.committer.date,
+        "additions": stats.additions if stats else 0,
+        "deletions": stats.deletions if stats else 0,
+        "files_changed": None,
+        "author_login": commit.author.login if commit.author else None,
+        "author_name": commit.commit.author.name,
+        "author_email": commit.commit.author.email,
+    }
+
+
+def iter_commits(repo, contributor, since=None, max_retries=3):
+    """
+    Yield a contributor's commit records page by page, newest first.
+
+    Each PyGithub Commit is converted to a record as soon as its page arrives,
+    so only one page of Commit objects is alive at a time. A rate-limited page
+    is retried once a token frees up instead of restarting the listing.
+    """
+    # Only pass `since` when set; PyGithub treats None differently from NotSet
+    filters = {"since": since} if since else {}
+    commits = repo.get_commits(author=contributor, **filters)
+    page_number = 0
+    while True:
+        for attempt in range(max_retries + 1):
+            try:
+                page = commits.get_page(page_number)
+                break
+            except github.RateLimitExceededException as e:
+                logging.error(
+                    f"Rate limit exceeded for contributor {contributor_login(contributor)}: {e}"
+                )
+                headers = e.headers or {}
+                logging.error(
+                    f"Rate limit resets at: {headers.get('X-RateLimit-Reset')}"
+                )
+                # The transport already recorded these headers; wait until a token frees up
+                if attempt == max_retries:
+                    raise
+                token_pool.wait()
+        if not page:
+            return
+        for commit in page:
+            yield commit_record(commit)
+        page_number += 1
+
+
+# Fetch commits for a contributor with error handling and rate limit checking.
+# GitHub errors, rate limits included, propagate so callers can back off and retry.
+def fetch_commits(repo, contributor, show_code=False, max_retries=3, since=None):
     try:
-        commits = list(repo.get_commits(author=contributor))
-        return commits
-    except github.RateLimitExceededException as e:
-        logging.error(f"Rate limit exceeded for contributor {contributor.login}: {e}")
-        headers = e.response.headers
-        logging.error(f"Rate Limit Headers: {headers}")
-        reset_time = headers.get("X-RateLimit-Reset")
-        logging.error(f"Rate limit resets at: {reset_time}")
+        return list(iter_commits(repo, contributor, since, max_retries))
+    except github.GithubException:
+        raise
+    except Exception as e:
+        logging.error(
+            f"Error fetching commits for {contributor_login(contributor)}: {e}"
+        )
         return None
+
+
+def fetch_commits_graphql(owner, repo_name, contributor, since=None):
+    """
+    Stream a contributor's commit records, including additions and deletions,
+    through paginated GraphQL queries instead of per-commit REST requests.
+    """
+    login = contributor_login(contributor)
+    try:
+        profile = fetch_user_profiles([login])[login]
     except Exception as e:
-        logging.error(f"Error fetching commits for {contributor.login}: {e}")
+        logging.error(f"Error fetching commits for {login} via GraphQL: {e}")
+        return None
+    if not profile.get("node_id"):
+        logging.error(f"Could not resolve GitHub user {login} via GraphQL")
         return None
+    return fetch_commit_history(
+        owner, repo_name, author_id=profile["node_id"], since=since
+    )
 
 
-# Process commit details for a contributor with linguistic analysis
-def process_commit_details(repo, contributor, commits, show_code=False):
-    commit_delta = len(commits)
-    total_insertions = 0
-    total_deletions = 0
-    commit_dates = defaultdict(int)
-
-    first_commit = commits[-1].commit.author.date if commit_delta > 0 else "N/A"
-    last_commit = commits[0].commit.author.date if commit_delta > 0 else "N/A"
-
-    if commit_delta > 1:
-        time_range = (last_commit - first_commit).days
-        commit_frequency = commit_delta / time_range if time_range > 0 else "N/A"
-    else:
-        commit_frequency = "N/A"
+def prefetch_in_order(items, fetch, max_workers=COMMIT_FETCH_WORKERS):
+    """
+    Run `fetch` on every item in worker threads, at most max_workers items
+    ahead of the consumer, and yield (item, future) pairs in input order.
 
-    with tqdm(
-        total=commit_delta,
-        desc=f"Analyzing commits for {contributor.login}",
-        unit="commit",
-        colour="red",
-        leave=False,
-    ) as commit_pbar:
-        for commit in commits:
-            commit_date = commit.commit.author.date.date()
-            commit_dates[commit_date] += 1
-
-            if commit.stats:
-                total_insertions += commit.stats.additions
-                total_deletions += commit.stats.deletions
-
-            # Analyze commit message linguistically
-            commit_message = commit.commit.message
-            syntax_results = linguistic_analyzer.analyze_syntax(commit_message)
-            ngrams = linguistic_analyzer.extract_ngrams(commit_message, n=2)
-            code_patterns = linguistic_analyzer.extract_code_patterns(commit_message)
-            likely_origin = linguistic_analyzer.identify_origin_from_syntax(
-                syntax_results
-            )
+    Fetching overlaps with the consumer's analysis of earlier items, while
+    only max_workers fetched results wait in memory at any time; `fetch`
+    should return a stream that has only fetched its first page.
+    """
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque(
+            (item, executor.submit(fetch, item))
+            for item in itertools.islice(items, max_workers)
+        )
+        while pending:
+            item, future = pending.popleft()
+            for item_ahead in itertools.islice(items, 1):
+                pending.append((item_ahead, executor.submit(fetch, item_ahead)))
+            yield item, future
 
-            # Add print statements to show linguistic analysis results
-            print(
-                f"\n{Fore.YELLOW}Linguistic Analysis for commit: {commit.sha}{Style.RESET_ALL}"
-            )
-            print(f"{Fore.GREEN}Commit Message:{Style.RESET_ALL} {commit_message}")
-            print(
-                f"{Fore.CYAN}Likely origin based on syntax:{Style.RESET_ALL} {likely_origin}"
-            )
-            print(f"{Fore.MAGENTA}Syntax Results:{Style.RESET_ALL} {syntax_results}")
-            print(f"{Fore.BLUE}N-grams:{Style.RESET_ALL} {ngrams}")
-            print(f"{Fore.LIGHTCYAN_EX}Code Patterns:{Style.RESET_ALL} {code_patterns}")
-            print("-" * 50)  # Divider line for better clarity
-
-            if show_code:
-                commit_details = repo.get_commit(commit.sha)
-                if commit_details.files:
-                    logging.debug(f"Contributor: {contributor.login}")
-                    logging.debug(f"Commit: {commit.sha}")
-                    logging.debug("Files changed:")
-                    for file in commit_details.files:
-                        logging.debug(f"  - {file.filename}: {file.changes} changes")
-                    logging.debug("\n")
 
-            commit_pbar.update(1)
+def peek_commits(commits):
+    """
+    Look at the first commit of a stream without losing it.
+
+    Returns:
+        tuple: (whether the stream is empty, iterator over all its commits)
+    """
+    commits = iter(commits)
+    first = next(commits, None)
+    if first is None:
+        return True, iter(())
+    return False, itertools.chain([first], commits)
+
+
+def with_syntax_results(items, message=lambda record: record["message"]):
+    """
+    Pair each item of a stream with the syntax analysis of its commit
+    message. Messages are parsed in batches with analyze_syntax_many, so the
+    stream is never held in memory as a whole. The first batch holds
+    SYNTAX_FIRST_BATCH_SIZE messages and each one after it doubles up to
+    SYNTAX_BATCH_SIZE, so a consumer that stops early parses little.
+
+    Args:
+        message (callable): Maps an item to its commit message.
+    """
+    items = iter(items)
+    batch_size = SYNTAX_FIRST_BATCH_SIZE
+    while True:
+        batch = list(itertools.islice(items, batch_size))
+        if not batch:
+            return
+        yield from zip(
+            batch, linguistic_analyzer.analyze_syntax_many(map(message, batch))
+        )
+        batch_size = min(batch_size * 2, SYNTAX_BATCH_SIZE)
+
+
+def analyze_commit(
+    repo, login, record, aggregate, show_code=False, syntax_results=None
+):
+    """
+    Fold one commit record into the aggregate and print its linguistic analysis.
+
+    Args:
+        syntax_results (dict): The message's syntax analysis, if already
+            parsed in a batch by with_syntax_results.
+    """
+    add_commit_to_aggregate(aggregate, record)
+
+    # Analyze commit message linguistically
+    commit_message = record["message"]
+    if syntax_results is None:
+        syntax_results = linguistic_analyzer.analyze_syntax(commit_message)
+    ngrams = linguistic_analyzer.extract_ngrams(commit_message, n=2)
+    code_patterns = linguistic_analyzer.extract_code_patterns(commit_message)
+    likely_origin = linguistic_analyzer.identify_origin_from_syntax(syntax_results)
+    aggregate["likely_origin"] = likely_origin
+
+    # Add print statements to show linguistic analysis results
+    print(
+        f"\n{Fore.YELLOW}Linguistic Analysis for commit: {record['sha']}{Style.RESET_ALL}"
+    )
+    print(f"{Fore.GREEN}Commit Message:{Style.RESET_ALL} {commit_message}")
+    print(f"{Fore.CYAN}Likely origin based on syntax:{Style.RESET_ALL} {likely_origin}")
+    print(f"{Fore.MAGENTA}Syntax Results:{Style.RESET_ALL} {syntax_results}")
+    print(f"{Fore.BLUE}N-grams:{Style.RESET_ALL} {ngrams}")
+    print(f"{Fore.LIGHTCYAN_EX}Code Patterns:{Style.RESET_ALL} {code_patterns}")
+    print("-" * 50)  # Divider line for better clarity
+
+    if show_code:
+        # Local git records already carry their files; otherwise ask the API
+        files = record.get("files")
+        if files is None:
+            files = [
+                {"filename": file.filename, "changes": file.changes}
+                for file in repo.get_commit(record["sha"]).files or []
+            ]
+        if files:
+            logging.debug(f"Contributor: {login}")
+            logging.debug(f"Commit: {record['sha']}")
+            logging.debug("Files changed:")
+            for file in files:
+                logging.debug(f"  - {file['filename']}: {file['changes']} changes")
+            logging.debug("\n")
+
+
+def report_commit_summary(login, aggregate):
+    """
+    Print a contributor's commit statistics from their running aggregate.
 
-    burst_days = [date for date, count in commit_dates.items() if count > 3]
+    Returns:
+        dict: The login together with the summarized statistics.
+    """
+    summary = summarize_commit_aggregate(aggregate)
+    burst_days = summary["commit_bursts"]
 
-    print(f"\n{Fore.YELLOW}Contributor: {contributor.login}{Style.RESET_ALL}")
-    print(f"  {Fore.GREEN}Commits:{Style.RESET_ALL} {commit_delta}")
-    print(f"  {Fore.CYAN}First Commit Date:{Style.RESET_ALL} {first_commit}")
-    print(f"  {Fore.CYAN}Last Commit Date:{Style.RESET_ALL} {last_commit}")
+    print(f"\n{Fore.YELLOW}Contributor: {login}{Style.RESET_ALL}")
+    print(f"  {Fore.GREEN}Commits:{Style.RESET_ALL} {summary['commit_delta']}")
+    print(f"  {Fore.CYAN}First Commit Date:{Style.RESET_ALL} {summary['first_commit']}")
+    print(f"  {Fore.CYAN}Last Commit Date:{Style.RESET_ALL} {summary['last_commit']}")
+    print(
+        f"  {Fore.CYAN}Commit Frequency:{Style.RESET_ALL} {summary['commit_frequency']} commits per day"
+    )
     print(
-        f"  {Fore.CYAN}Commit Frequency:{Style.RESET_ALL} {commit_frequency} commits per day"
+        f"  {Fore.CYAN}Total Insertions:{Style.RESET_ALL} {summary['total_insertions']}"
+    )
+    print(
+        f"  {Fore.CYAN}Total Deletions:{Style.RESET_ALL} {summary['total_deletions']}"
     )
-    print(f"  {Fore.CYAN}Total Insertions:{Style.RESET_ALL} {total_insertions}")
-    print(f"  {Fore.CYAN}Total Deletions:{Style.RESET_ALL} {total_deletions}")
     if burst_days:
         print(
             f"  {Fore.MAGENTA}Commit Bursts on:{Style.RESET_ALL} {', '.join(map(str, burst_days))}"
@@ -110,25 +270,151 @@ def process_commit_details(repo, contributor, commits, show_code=False):
     else:
         print(f"  {Fore.MAGENTA}No significant commit bursts detected{Style.RESET_ALL}")
     print(
-        f"  {Fore.CYAN}Likely origin based on commit syntax:{Style.RESET_ALL} {likely_origin}"
+        f"  {Fore.CYAN}Likely origin based on commit syntax:{Style.RESET_ALL} {summary['likely_origin']}"
     )
 
-    return {
-        "login": contributor.login,
-        "commit_delta": commit_delta,
-        "first_commit": first_commit,
-        "last_commit": last_commit,
-        "commit_frequency": commit_frequency,
-        "total_insertions": total_insertions,
-        "total_deletions": total_deletions,
-        "commit_bursts": burst_days,
-        "likely_origin": likely_origin,
-    }
+    return dict(login=login, **summary)
+
+
+# Process commit details for a contributor with linguistic analysis
+def process_commit_details(
+    repo, contributor, commits, show_code=False, aggregate=None
+):
+    """
+    Analyze a contributor's commits and report their commit statistics.
+
+    Args:
+        commits (iterable): Commits or commit records. Generators are consumed
+            one commit at a time; only the running aggregate is kept.
+        aggregate (dict): Optional running aggregate from an earlier scan. New
+            commits are folded into it in place, so the caller can persist it.
+    """
+    login = contributor_login(contributor)
+    if aggregate is None:
+        aggregate = new_commit_aggregate()
+
+    with tqdm(
+        total=len(commits) if hasattr(commits, "__len__") else None,
+        desc=f"Analyzing commits for {login}",
+        unit="commit",
+        colour="red",
+        leave=False,
+    ) as commit_pbar:
+        for record, syntax_results in with_syntax_results(map(commit_record, commits)):
+            analyze_commit(repo, login, record, aggregate, show_code, syntax_results)
+            commit_pbar.update(1)
+
+    return report_commit_summary(login, aggregate)
+
+
+def process_commits_incrementally(
+    repo, owner, repo_name, contributor, commits, show_code=False
+):
+    """
+    Merge commits fetched since the stored high-water mark into the
+    contributor's stored aggregate, analyze only the unseen ones, and store
+    the new mark.
+    """
+    login = contributor_login(contributor)
+    aggregate = load_commit_aggregate(owner, repo_name, login)
+    if aggregate is None:
+        aggregate = new_commit_aggregate()
+    seen_commits = aggregate["commit_delta"]
+    is_new = new_commit_filter(aggregate)
+    new_commits = (
+        record for record in map(commit_record, commits) if is_new(record)
+    )
+    result = process_commit_details(
+        repo, contributor, new_commits, show_code, aggregate=aggregate
+    )
+    logging.info(
+        f"{login}: {aggregate['commit_delta'] - seen_commits} new commits since last scan"
+    )
+    save_commit_aggregate(owner, repo_name, login, aggregate)
+    return result
+
+
+def process_commit_stream(
+    repo,
+    records,
+    key_func,
+    show_code=False,
+    incremental=False,
+    owner=None,
+    repo_name=None,
+    save_mark=True,
+):
+    """
+    Analyze one newest-first stream of commit records from many contributors,
+    such as a whole-history walk, keeping only a running aggregate per
+    contributor. Summaries are reported once the stream is exhausted.
+
+    Args:
+        key_func (callable): Maps a record to its contributor key; records
+            mapped to None are skipped.
+        incremental (bool): Merge into and store the aggregates and the
+            repository mark of owner/repo_name.
+        save_mark (bool): Store the repository mark; off for streams fetched
+            from per-contributor marks rather than the repository mark.
+
+    Returns:
+        list: One summary dict per contributor.
+    """
+    aggregates = {}
+    filters = {}
+    newest = None
+
+    def keyed_records():
+        nonlocal newest
+        for record in records:
+            key = key_func(record)
+            if not key:
+                continue
+            aggregate = aggregates.get(key)
+            if aggregate is None:
+                if incremental:
+                    aggregate = load_commit_aggregate(owner, repo_name, key)
+                aggregate = aggregates[key] = aggregate or new_commit_aggregate()
+                filters[key] = new_commit_filter(aggregate)
+            if incremental and not filters[key](record):
+                continue
+            committed = committed_date(record)
+            if newest is None or committed > newest:
+                newest = committed
+            yield key, record
+
+    with tqdm(desc="Analyzing commits", unit="commit", colour="red", leave=False) as pbar:
+        for (key, record), syntax_results in with_syntax_results(
+            keyed_records(), message=lambda item: item[1]["message"]
+        ):
+            analyze_commit(
+                repo, key, record, aggregates[key], show_code, syntax_results
+            )
+            pbar.update(1)
+
+    results = []
+    for key, aggregate in aggregates.items():
+        results.append(report_commit_summary(key, aggregate))
+        if incremental:
+            save_commit_aggregate(owner, repo_name, key, aggregate)
+    if incremental and save_mark:
+        save_repository_mark(owner, repo_name, newest)
+    return results
 
 
 # New top-level function for commit analysis
 def analyze_commits(
-    owner, repo_name, contributor=None, show_code=False, enable_commit_analysis=True
+    owner,
+    repo_name,
+    contributor=None,
+    show_code=False,
+    enable_commit_analysis=True,
+    use_graphql=False,
+    use_async=False,
+    incremental=False,
+    backend="api",
+    repo_location=None,
+    max_workers=COMMIT_FETCH_WORKERS,
 ):
     """
     Analyze commits for a repository. Optionally filter commits by a specific contributor.
@@ -140,6 +426,17 @@ def analyze_commits(
         contributor (str): Optional contributor to filter commits.
         show_code (bool): Whether to show detailed file changes in the commits.
         enable_commit_analysis (bool): Whether to run commit analysis.
+        use_graphql (bool): Fetch commit history in bulk through GraphQL.
+        use_async (bool): Fetch contributors and their histories concurrently
+            with the asyncio client.
+        incremental (bool): Only fetch commits newer than the marks stored by
+            the previous run and merge them into the stored aggregates.
+        backend (str): "api" to read commits from GitHub, "git" to compute them
+            from a local clone without per-commit API requests.
+        repo_location (str): Remote URL or local path cloned by the git backend;
+            defaults to the GitHub URL of owner/repo_name.
+        max_workers (int): Contributors whose commits are fetched from the
+            REST API concurrently while earlier ones are analyzed.
     """
     print(
         f"\n{Fore.YELLOW}Analyzing commits for repository: {owner}/{repo_name}{Style.RESET_ALL}"
@@ -148,25 +445,124 @@ def analyze_commits(
         print("Commit analysis is disabled. Skipping...")
         return
 
-    g = github_client()
     print(f"Analyzing commits for {owner}/{repo_name}...")
 
-    repo = g.get_repo(f"{owner}/{repo_name}")
-
-    if contributor:
-        commits = fetch_commits(repo, contributor, show_code)
-        if commits:
-            process_commit_details(repo, contributor, commits, show_code)
-        else:
-            print(f"No commits found for contributor: {contributor}")
+    if backend == "git":
+        # Everything comes from the clone, so no GitHub client is needed
+        repo = None
+        repo_path = clone_repository(
+            repo_location or f"https://github.com/{owner}/{repo_name}"
+        )
     else:
-        contributors = repo.get_contributors()
-        for contributor in contributors:
-            commits = fetch_commits(repo, contributor, show_code)
-            if commits:
-                process_commit_details(repo, contributor, commits, show_code)
+        g = github_client()
+        repo = g.get_repo(f"{owner}/{repo_name}")
+
+    def since_for(login):
+        # High-water mark of an incremental scan; None fetches the full history
+        if not incremental:
+            return None
+        aggregate = load_commit_aggregate(owner, repo_name, login)
+        return aggregate["last_committed"] if aggregate else None
+
+    def report(contributor, commits):
+        if incremental:
+            return process_commits_incrementally(
+                repo, owner, repo_name, contributor, commits, show_code
+            )
+        return process_commit_details(repo, contributor, commits, show_code)
+
+    if backend == "git":
+        if contributor:
+            since = since_for(contributor)
+            # Commits under a non-noreply email are matched by the profile email
+            profile = get_cached_profiles([contributor]).get(contributor) or {}
+            empty, commits = peek_commits(
+                iter_contributor_commits(
+                    repo_path,
+                    contributor,
+                    emails=[profile["email"]] if profile.get("email") else [],
+                    since=since,
+                )
+            )
+            if not empty or since:
+                report(contributor, commits)
             else:
-                print(f"No commits found for contributor: {contributor.login}")
+                print(f"No commits found for contributor: {contributor}")
+        else:
+            since = load_repository_mark(owner, repo_name) if incremental else None
+            process_commit_stream(
+                repo,
+                iter_git_commits(repo_path, since=since),
+                contributor_key,
+                show_code,
+                incremental=incremental,
+                owner=owner,
+                repo_name=repo_name,
+            )
+    elif contributor:
+        since = since_for(contributor)
+        try:
+            if use_graphql:
+                commits = fetch_commits_graphql(owner, repo_name, contributor, since)
+            else:
+                commits = iter_commits(repo, contributor, since=since)
+            if commits is not None:
+                empty, commits = peek_commits(commits)
+            if commits is not None and (not empty or since):
+                report(contributor, commits)
+            else:
+                print(f"No commits found for contributor: {contributor}")
+        except Exception as e:
+            logging.error(f"Error fetching commits for {contributor}: {e}")
+    elif use_async:
+        # Histories are fetched concurrently but streamed, one page at a time
+        profiles = fetch_repository(owner, repo_name)
+        process_commit_stream(
+            repo,
+            iter_commit_histories(
+                owner,
+                repo_name,
+                [p for p in profiles if p.get("node_id")],
+                since_for=since_for,
+            ),
+            lambda record: record["author_login"],
+            show_code,
+            incremental=incremental,
+            owner=owner,
+            repo_name=repo_name,
+            save_mark=False,
+        )
+    elif use_graphql:
+        # One pass over the whole history instead of one listing per contributor
+        since = load_repository_mark(owner, repo_name) if incremental else None
+        process_commit_stream(
+            repo,
+            fetch_commit_history(owner, repo_name, since=since),
+            lambda record: record["author_login"],
+            show_code,
+            incremental=incremental,
+            owner=owner,
+            repo_name=repo_name,
+        )
+    else:
+
+        def fetch(contributor):
+            # Only the first page is fetched ahead; the rest stream while analyzed
+            since = since_for(contributor.login)
+            return since, peek_commits(iter_commits(repo, contributor, since=since))
+
+        # Workers fetch the next contributors' first pages while one is analyzed
+        for contributor, future in prefetch_in_order(
+            repo.get_contributors(), fetch, max_workers
+        ):
+            try:
+                since, (empty, commits) = future.result()
+                if not empty or since:
+                    report(contributor, commits)
+                else:
+                    print(f"No commits found for contributor: {contributor.login}")
+            except Exception as e:
+                logging.error(f"Error fetching commits for {contributor.login}: {e}")
 
     print(
         f"\n{Fore.GREEN}Finished analyzing commits for {owner}/{repo_name}.{Style.RESET_ALL}"
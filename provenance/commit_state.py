@@ -0,0 +1,188 @@
+from collections import defaultdict
+from datetime import date, datetime
+import logging
+from utils.cache import PersistentCache
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Per-repository commit aggregates, kept between runs for incremental scans
+_state_store = None
+
+
+def _store():
+    global _state_store
+    if _state_store is None:
+        _state_store = PersistentCache("commit_state")
+    return _state_store
+
+
+def new_commit_aggregate():
+    """
+    Create an empty running aggregate of a contributor's commits.
+    """
+    return {
+        "commit_delta": 0,
+        "first_commit": None,
+        "last_commit": None,
+        "total_insertions": 0,
+        "total_deletions": 0,
+        "commit_dates": defaultdict(int),
+        # High-water mark of incremental scans. It is a committer date, like
+        # the `since` filters of the REST API, GraphQL and git log, so commits
+        # authored earlier but merged later are still picked up.
+        "last_committed": None,
+        # SHAs committed at `last_committed`; skipped when re-fetching since it
+        "last_shas": [],
+        "likely_origin": "Unknown",
+    }
+
+
+def committed_date(record):
+    """
+    Committer date of a commit record, falling back to its author date.
+    """
+    return record.get("committed_date") or record["date"]
+
+
+def add_commit_to_aggregate(aggregate, record):
+    """
+    Fold one commit record into a running aggregate.
+    """
+    commit_date = record["date"]
+    aggregate["commit_delta"] += 1
+    aggregate["total_insertions"] += record["additions"] or 0
+    aggregate["total_deletions"] += record["deletions"] or 0
+    aggregate["commit_dates"][commit_date.date()] += 1
+
+    if aggregate["first_commit"] is None or commit_date < aggregate["first_commit"]:
+        aggregate["first_commit"] = commit_date
+    if aggregate["last_commit"] is None or commit_date > aggregate["last_commit"]:
+        aggregate["last_commit"] = commit_date
+
+    committed = committed_date(record)
+    if aggregate["last_committed"] is None or committed > aggregate["last_committed"]:
+        aggregate["last_committed"] = committed
+        aggregate["last_shas"] = [record["sha"]]
+    elif committed == aggregate["last_committed"]:
+        aggregate["last_shas"].append(record["sha"])
+
+
+def summarize_commit_aggregate(aggregate):
+    """
+    Derive the reported commit statistics from a running aggregate.
+
+    Returns:
+        dict: first/last commit, frequency, totals and burst days.
+    """
+    commit_delta = aggregate["commit_delta"]
+    first_commit = aggregate["first_commit"] or "N/A"
+    last_commit = aggregate["last_commit"] or "N/A"
+
+    if commit_delta > 1:
+        time_range = (last_commit - first_commit).days
+        commit_frequency = commit_delta / time_range if time_range > 0 else "N/A"
+    else:
+        commit_frequency = "N/A"
+
+    burst_days = sorted(
+        day for day, count in aggregate["commit_dates"].items() if count > 3
+    )
+
+    return {
+        "commit_delta": commit_delta,
+        "first_commit": first_commit,
+        "last_commit": last_commit,
+        "commit_frequency": commit_frequency,
+        "total_insertions": aggregate["total_insertions"],
+        "total_deletions": aggregate["total_deletions"],
+        "commit_bursts": burst_days,
+        "likely_origin": aggregate["likely_origin"],
+    }
+
+
+def new_commit_filter(aggregate):
+    """
+    Build a predicate telling whether a commit fetched `since` the aggregate's
+    high-water mark was not yet counted.
+
+    The mark is captured up front, so the predicate stays valid while the
+    same aggregate is updated from a newest-first stream of commits.
+    """
+    last_committed = aggregate["last_committed"]
+    last_shas = set(aggregate["last_shas"])
+
+    def is_new(record):
+        if last_committed is None:
+            return True
+        if committed_date(record) < last_committed:
+            return False
+        return record["sha"] not in last_shas
+
+    return is_new
+
+
+def load_commit_aggregate(owner, repo_name, login):
+    """
+    Load the stored aggregate of a contributor, or None on a first scan.
+    """
+    stored = _store().get(f"{owner}/{repo_name}:{login}")
+    if stored is None:
+        return None
+
+    aggregate = new_commit_aggregate()
+    aggregate.update(
+        commit_delta=stored["commit_delta"],
+        total_insertions=stored["total_insertions"],
+        total_deletions=stored["total_deletions"],
+        last_shas=stored["last_shas"],
+        likely_origin=stored["likely_origin"],
+    )
+    # Aggregates stored before the committer-date mark fall back to last_commit
+    stored.setdefault("last_committed", stored["last_commit"])
+    for key in ("first_commit", "last_commit", "last_committed"):
+        if stored[key]:
+            aggregate[key] = datetime.fromisoformat(stored[key])
+    for day, count in stored["commit_dates"].items():
+        aggregate["commit_dates"][date.fromisoformat(day)] = count
+    return aggregate
+
+
+def save_commit_aggregate(owner, repo_name, login, aggregate):
+    """
+    Persist a contributor's aggregate as the high-water mark for the next scan.
+    """
+    _store().set(
+        f"{owner}/{repo_name}:{login}",
+        {
+            "commit_delta": aggregate["commit_delta"],
+            "first_commit": _isoformat(aggregate["first_commit"]),
+            "last_commit": _isoformat(aggregate["last_commit"]),
+            "last_committed": _isoformat(aggregate["last_committed"]),
+            "total_insertions": aggregate["total_insertions"],
+            "total_deletions": aggregate["total_deletions"],
+            "commit_dates": {
+                day.isoformat(): count
+                for day, count in aggregate["commit_dates"].items()
+            },
+            "last_shas": aggregate["last_shas"],
+            "likely_origin": aggregate["likely_origin"],
+        },
+    )
+
+
+def load_repository_mark(owner, repo_name):
+    """
+    Return the newest committer date seen by the last whole-history scan.
+    """
+    stored = _store().get(f"{owner}/{repo_name}")
+    return datetime.fromisoformat(stored) if stored else None
+
+
+def save_repository_mark(owner, repo_name, last_commit):
+    if last_commit is not None:
+        _store().set(f"{owner}/{repo_name}", last_commit.isoformat())
+
+
+def _isoformat(value):
+    return value.isoformat() if value is not None else None
@@ -3,30 +3,54 @@ import random
 import logging
 from collections import defaultdict
 from tqdm import tqdm
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from provenance.geography import identify_geography
-from provenance.commit import fetch_commits
+from provenance.geography import identify_geography, identify_geography_dict
+from provenance.commit import (
+    iter_commits,
+    peek_commits,
+    prefetch_in_order,
+    process_commit_details,
+    process_commit_stream,
+)
+from services.github_client import (
+    fetch_contributor_logins,
+    fetch_commit_history,
+    token_pool,
+)
+from services.profile_service import contributor_login, resolve_profiles
+from services.email_service import prefetch_domain_locations
+from provenance.normalize_place import normalize_places
+from services.async_github_client import (
+    fetch_repository,
+    iter_commit_histories,
+    ASYNC_CONCURRENCY,
+)
 from github.GithubException import GithubException, RateLimitExceededException
 
+# Rate limits are paced by the shared scheduler, so concurrency is not capped by fear of them
+DEFAULT_MAX_WORKERS = 8
 
-# Exponential backoff with jitter
+
+# Exponential backoff with jitter, used for transient GitHub errors
 def exponential_backoff(attempt, max_delay=120):
     delay = min(2**attempt + random.uniform(0, 1), max_delay)
     logging.warning(f"Backing off for {delay:.2f} seconds before retrying...")
     time.sleep(delay)
 
 
-# Fetch commits with exponential backoff
+# Fetch the first page of commits with exponential backoff; the returned
+# stream fetches the remaining pages as it is consumed
 def fetch_commits_with_backoff(repo, contributor, show_code, max_retries=5):
     attempt = 0
     while attempt < max_retries:
         try:
-            return fetch_commits(repo, contributor, show_code)
+            empty, commits = peek_commits(iter_commits(repo, contributor))
+            return None if empty else commits
         except RateLimitExceededException as e:
             logging.warning(
                 f"Rate limit exceeded for contributor {contributor.login}: {e}"
             )
-            exponential_backoff(attempt)
+            # Wait exactly as long as GitHub's headers say instead of guessing
+            token_pool.wait()
             attempt += 1
         except GithubException as e:
             logging.error(f"GitHub error for contributor {contributor.login}: {e}")
@@ -48,6 +72,9 @@ def get_contributors(
     verbose=False,
     adversarial=False,
     city_country_dict=None,  # Pass in the city-country dictionary
+    use_graphql=False,
+    max_workers=DEFAULT_MAX_WORKERS,
+    use_async=False,
 ):
     try:
         repo = g.get_repo(f"{owner}/{repo_name}")
@@ -55,6 +82,28 @@ def get_contributors(
         logging.error(f"Error accessing repository {owner}/{repo_name}: {e}")
         return []
 
+    if use_async:
+        return get_contributors_async(
+            repo,
+            owner,
+            repo_name,
+            show_commits=show_commits,
+            show_code=show_code,
+            verbose=verbose,
+            city_country_dict=city_country_dict,
+        )
+
+    if use_graphql:
+        return get_contributors_graphql(
+            repo,
+            owner,
+            repo_name,
+            show_commits=show_commits,
+            show_code=show_code,
+            verbose=verbose,
+            city_country_dict=city_country_dict,
+        )
+
     # Get total count of contributors
     contributors = repo.get_contributors()
     total_contributors = contributors.totalCount
@@ -63,52 +112,38 @@ def get_contributors(
     if show_commits or show_code:
         contributor_list = []
 
-        # Limit the number of concurrent workers to reduce API pressure
-        with ThreadPoolExecutor(
-            max_workers=2
-        ) as executor:  # Lower concurrency to avoid rate limits
-            futures = {
-                executor.submit(
-                    fetch_commits_with_backoff, repo, contributor, show_code
-                ): contributor
-                for contributor in contributors
-            }
-
-            with tqdm(
-                total=total_contributors,
-                desc="Analyzing contributors",
-                unit="contributor",
-                colour="green",
-            ) as contributor_pbar:
-                for future in as_completed(futures):
-                    contributor = futures[future]
-                    result = future.result()
-
-                    if result is None:
-                        logging.error(
-                            f"Failed to fetch commits for {contributor.login}"
-                        )
-                        continue
-
-                    # Print commit delta and additional commit-related information
-                    print(f"Contributor: {result['login']}")
-                    print(f"  Commits: {result['commit_delta']}")
-                    print(f"  First Commit Date: {result['first_commit']}")
-                    print(f"  Last Commit Date: {result['last_commit']}")
-                    print(
-                        f"  Commit Frequency: {result['commit_frequency']} commits per day"
+        # Workers share token_pool, which paces them against the API budget;
+        # they fetch the next contributors' first pages while one is analyzed
+        with tqdm(
+            total=total_contributors,
+            desc="Analyzing contributors",
+            unit="contributor",
+            colour="green",
+        ) as contributor_pbar:
+            for contributor, future in prefetch_in_order(
+                contributors,
+                lambda contributor: fetch_commits_with_backoff(
+                    repo, contributor, show_code
+                ),
+                max_workers,
+            ):
+                commits = future.result()
+
+                if commits is None:
+                    logging.error(f"Failed to fetch commits for {contributor.login}")
+                    continue
+
+                try:
+                    result = process_commit_details(
+                        repo, contributor, commits, show_code
                     )
-                    print(f"  Total Insertions: {result['total_insertions']}")
-                    print(f"  Total Deletions: {result['total_deletions']}")
-                    if result["commit_bursts"]:
-                        print(
-                            f"  Commit Bursts on: {', '.join(map(str, result['commit_bursts']))}"
-                        )
-                    else:
-                        print(f"  No significant commit bursts detected")
-
-                    contributor_list.append(result)
-                    contributor_pbar.update(1)
+                except Exception as e:
+                    logging.error(
+                        f"Error fetching commits for {contributor.login}: {e}"
+                    )
+                    continue
+                contributor_list.append(result)
+                contributor_pbar.update(1)
 
         return contributor_list
 
@@ -126,15 +161,29 @@ def get_contributors(
                 pbar.update(1)  # Update the progress bar
         else:
             contributor_list = []
+            # Resolve all uncached profiles in batches before the per-contributor loop
+            contributors = list(contributors)
+            profiles = resolve_profiles(
+                [contributor.login for contributor in contributors]
+            )
+            # Look up every unique email domain and location in batches before the loop
+            prefetch_domain_locations(p.get("email") for p in profiles.values())
+            places = normalize_places(p.get("location") for p in profiles.values())
             for contributor in contributors:
                 # Perform geography lookups
+                profile = profiles.get(contributor.login)
                 geography = identify_geography(
-                    contributor, city_country_dict, verbose=verbose
+                    profile or contributor,
+                    city_country_dict,
+                    verbose=verbose,
+                    normalized_place=places.get(profile.get("location"))
+                    if profile
+                    else None,
                 )
 
                 # Print geography details
                 tqdm.write(
-                    f"Contributor Profile Location (raw from GitHub): {contributor.location or 'Unknown'}"
+                    f"Contributor Profile Location (raw from GitHub): {geography['profile_geo'] or 'Unknown'}"
                 )
                 tqdm.write(f"Contributor: {contributor.login}")
                 tqdm.write(f"  Email-based Location: {geography['email_geo']}")
@@ -151,3 +200,90 @@ def get_contributors(
                 pbar.update(1)  # Update the progress bar
 
             return contributor_list
+
+
+# Bulk variant of get_contributors backed by GraphQL profile and history queries
+def get_contributors_graphql(
+    repo,
+    owner,
+    repo_name,
+    show_commits=False,
+    show_code=False,
+    verbose=False,
+    city_country_dict=None,
+):
+    if show_commits or show_code:
+        # One streamed pass over the history; commits without a GitHub author are skipped
+        return process_commit_stream(
+            repo,
+            fetch_commit_history(owner, repo_name),
+            lambda record: record["author_login"],
+            show_code,
+        )
+
+    logins = fetch_contributor_logins(owner, repo_name)
+    profiles = resolve_profiles(logins)
+    profiles = [profiles.get(login, {"login": login}) for login in logins]
+    return analyze_fetched_profiles(profiles, city_country_dict, verbose=verbose)
+
+
+# Variant of get_contributors that fetches everything through the asyncio client
+def get_contributors_async(
+    repo,
+    owner,
+    repo_name,
+    show_commits=False,
+    show_code=False,
+    verbose=False,
+    city_country_dict=None,
+    concurrency=ASYNC_CONCURRENCY,
+):
+    profiles = fetch_repository(owner, repo_name, concurrency=concurrency)
+    if show_commits or show_code:
+        # Histories are fetched concurrently but streamed, one page at a time
+        return process_commit_stream(
+            repo,
+            iter_commit_histories(
+                owner,
+                repo_name,
+                [p for p in profiles if p.get("node_id")],
+                concurrency=concurrency,
+            ),
+            lambda record: record["author_login"],
+            show_code,
+        )
+    return analyze_fetched_profiles(profiles, city_country_dict, verbose=verbose)
+
+
+# Run geography lookups over contributor dicts that were fetched in bulk
+def analyze_fetched_profiles(profiles, city_country_dict, verbose=False):
+    contributor_list = []
+    prefetch_domain_locations(profile.get("email") for profile in profiles)
+    places = normalize_places(profile.get("location") for profile in profiles)
+    for profile in tqdm(
+        profiles,
+        desc="Analyzing contributors",
+        unit="contributor",
+        colour="green",
+        leave=True,
+    ):
+        geography = identify_geography_dict(
+            profile,
+            city_country_dict,
+            verbose=verbose,
+            normalized_place=places.get(profile.get("location")),
+        )
+
+        tqdm.write(
+            f"Contributor Profile Location (raw from GitHub): {profile['location'] or 'Unknown'}"
+        )
+        tqdm.write(f"Contributor: {contributor_login(profile)}")
+        tqdm.write(f"  Email-based Location: {geography['email_geo']}")
+        tqdm.write(f"  Profile Location: {geography['profile_geo']}")
+        tqdm.write(
+            f"  Final Location: {geography['final_location']} with {geography['confidence']:.2f}% confidence\n"
+        )
+
+        contributor_list.append({"login": profile["login"], "geography": geography})
+
+    return contributor_list
@@ -1,14 +1,8 @@
 import json
-from utils.utils import load_country_codes
-from services.email_service import (
-    resolve_domain_location,
-    dns_mx_lookup,
-    whois_lookup,
-)
+from utils.gazetteer import get_gazetteer
+from services.email_service import resolve_domain_location
 from provenance.normalize_place import normalize_place
-
-# Load country codes
-country_code_dict = load_country_codes("data/country_codes.csv")
+from services.profile_service import resolve_profile
 
 # Load weights from weights.json
 with open("provenance/weights.json", "r") as f:
@@ -32,7 +26,7 @@ def normalize_country_name(country):
     """
     if country is None:
         return "Unknown"
-    return country_code_dict.get(country.upper(), country)
+    return get_gazetteer().country_codes().get(country.upper(), country)
 
 
 def determine_final_location(
@@ -117,75 +111,45 @@ def determine_final_location(
     return final_location, confidence
 
 
-def identify_geography(contributor, city_country_dict, verbose=False):
+def identify_geography(
+    contributor, city_country_dict, verbose=False, normalized_place=None
+):
     """
     Identifies the geography of a contributor by analyzing their email, profile, and organization data.
+    Profile fields are read through the cached profile resolver, so NamedUser objects
+    never trigger lazy per-attribute API requests.
     """
-    # Accessing attributes from the NamedUser object
-    username = getattr(contributor, "login", "Unknown")
-    email = getattr(contributor, "email", "N/A")
-    profile_geo = getattr(contributor, "location", "Unknown")
-    organization = getattr(contributor, "company", "Unknown")
-
-    email_geo = "Unknown"
-    if email and "@" in email:
-        domain_info = resolve_domain_location(email)
-        email_geo = domain_info.get("country", "Unknown")
-
-    # Normalize Profile Geo using normalize_place function
-    normalized_place_data = normalize_place(profile_geo)  # Now returns a dict
-    normalized_profile_geo = normalized_place_data.get("matched_place", "Unknown")
-    profile_geo_score = normalized_place_data.get("score", 0)
-
-    # Debug for normalize_place results
-    debug_print(
-        verbose,
-        f"DEBUG: Profile Geo '{profile_geo}' matched with '{normalized_profile_geo}' (Score: {profile_geo_score})",
-    )
-
-    final_location, confidence = determine_final_location(
-        email_geo,
-        normalized_profile_geo,
-        profile_geo_score,
-        organization,
+    return identify_geography_dict(
+        resolve_profile(contributor),
+        city_country_dict,
         verbose=verbose,
+        normalized_place=normalized_place,
     )
 
-    if email and "@" in email:
-        domain = email.split("@")[-1]
-        debug_print(verbose, f"DNS and WHOIS for domain: {domain}")
-        debug_print(verbose, f"  MX Records: {', '.join(dns_mx_lookup(domain))}")
-        debug_print(verbose, f"  WHOIS Country: {email_geo}")
-
-    return {
-        "username": username,
-        "email": email,
-        "email_geo": email_geo,
-        "profile_geo": profile_geo,
-        "organization_geo": organization,
-        "final_location": final_location,
-        "confidence": confidence,
-    }
-
 
 # The second version of identify_geography is a fallback for contributors stored as dictionaries
-def identify_geography_dict(contributor_dict, city_country_dict, verbose=False):
+def identify_geography_dict(
+    contributor_dict, city_country_dict, verbose=False, normalized_place=None
+):
     """
     Fallback version of identify_geography that works on contributors stored as dictionaries
-    instead of objects.
+    instead of objects. Dictionaries without profile fields are resolved by login.
+    `normalized_place` is the profile location already normalized by normalize_places.
     """
+    contributor_dict = resolve_profile(contributor_dict)
     username = contributor_dict.get("login", "Unknown")
     email = contributor_dict.get("email", "N/A")
     profile_geo = contributor_dict.get("location", "Unknown")
     organization = contributor_dict.get("company", "Unknown")
 
     email_geo = "Unknown"
+    domain_info = None
     if email and "@" in email:
         domain_info = resolve_domain_location(email)
         email_geo = domain_info.get("country", "Unknown")
 
     # Normalize Profile Geo using normalize_place function
-    normalized_place_data = normalize_place(profile_geo)  # Now returns a dict
+    normalized_place_data = normalized_place or normalize_place(profile_geo)
     normalized_profile_geo = normalized_place_data.get("matched_place", "Unknown")
     profile_geo_score = normalized_place_data.get("score", 0)
 
@@ -203,10 +167,10 @@ def identify_geography_dict(contributor_dict, city_country_dict, verbose=False):
         verbose=verbose,
     )
 
-    if email and "@" in email:
-        domain = email.split("@")[-1]
-        debug_print(verbose, f"DNS and WHOIS for domain: {domain}")
-        debug_print(verbose, f"  MX Records: {', '.join(dns_mx_lookup(domain))}")
+    if domain_info:
+        debug_print(verbose, f"DNS and WHOIS for domain: {domain_info['domain']}")
+        debug_print(verbose, f"  MX Records: {', '.join(domain_info['mx_records'])}")
+        debug_print(verbose, f"  MX Country: {domain_info['mx_country']}")
         debug_print(verbose, f"  WHOIS Country: {email_geo}")
 
     return {
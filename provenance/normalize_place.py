@@ -1,137 +1,401 @@
-import geograpy
-from rapidfuzz import process
-from config.setup_nltk import setup_nltk_data
-from utils.utils import load_country_codes, load_world_cities
-
-# Ensure nltk data models are downloaded and setup in /data/nltk
-setup_nltk_data()
-
-# Load the country codes and world cities using your existing utils functions
-country_codes_path = "data/country_codes.csv"
-world_cities_path = "data/world_cities.csv"
-country_code_dict = load_country_codes(country_codes_path)
-city_country_dict = load_world_cities(world_cities_path)
-
-# Example database of standardized place names for fuzzy matching
-known_places = [
-    "New York City",
-    "Los Angeles",
-    "San Francisco",
-    "Austin, Texas",
-    "London",
-    "Luxemburg",
-    "Paris",
-    "Tokyo",
-    "Berlin",
-    "Chicago",
-    "Houston",
-    "United States of America",
-]
+import hashlib
+import logging
+import threading
+from collections import OrderedDict, defaultdict
+from rapidfuzz import fuzz, process
+from utils.cache import PersistentCache
+from utils.gazetteer import get_gazetteer, source_version
+from services.location_service import geocode_locations, geocoding_enabled
+from provenance.place_extractor import (
+    CCTLD_PATH,
+    COUNTRY_SCORE,
+    PLACE_ALIASES_PATH,
+    SEGMENT_PATTERN,
+    extract_place,
+    get_place_extractor,
+    normalize_tokens,
+)
 
+# Initialize logger
+logger = logging.getLogger(__name__)
 
-def normalize_place(location):
+# Minimum similarity (0-100) for a fuzzy match against the gazetteer
+FUZZY_SCORE_CUTOFF = 80
+
+# One changed letter in a short name still scores above 80 ("munchen" vs
+# "mulchen" is 85.7), so queries this short need a closer match
+SHORT_QUERY_LENGTH = 8
+SHORT_QUERY_SCORE_CUTOFF = 90
+
+# Fuzzy candidates must share this many leading characters of the first token
+FIRST_TOKEN_PREFIX = 2
+
+# Score of a location resolved only by the LocationIQ geocoder
+GEOCODE_SCORE = 80
+
+# Bump when the normalization logic changes to invalidate cached results
+NORMALIZER_VERSION = 2
+
+# Normalized locations kept in memory in front of the persistent cache
+PLACE_MEMORY_CACHE_SIZE = 10000
+
+# Location keys are never empty, so the empty key holds the cache version
+VERSION_KEY = ""
+
+_fuzzy_index = None
+
+_place_cache = None
+_memory_cache = OrderedDict()
+_cache_lock = threading.Lock()
+place_cache_stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+
+def _empty_result():
+    return {
+        "matched_place": "Unknown",
+        "score": 0,
+        "geograpy_data": {},
+        "fuzzy_match": {},
+    }
+
+
+def location_key(location):
+    """
+    Cache key of a location string: casefolded, with whitespace collapsed.
     """
-    Normalize a location string by first extracting place names using geograpy,
-    then using fuzzy matching or country_codes.csv as a fallback.
+    return " ".join(location.casefold().split())
+
+
+def _normalizer_version():
+    """
+    Fingerprint of everything a normalization result depends on: the
+    gazetteer index, the alias and ccTLD tables and the matching logic.
+    """
+    digest = hashlib.sha1(get_gazetteer().version.encode())
+    digest.update(source_version((PLACE_ALIASES_PATH, CCTLD_PATH)).encode())
+    digest.update(
+        f"{NORMALIZER_VERSION}:{FUZZY_SCORE_CUTOFF}:{SHORT_QUERY_SCORE_CUTOFF}".encode()
+    )
+    return digest.hexdigest()
+
+
+def _cache():
+    """
+    Return the persistent place cache, clearing it when it was filled by an
+    older gazetteer or normalizer.
+    """
+    global _place_cache
+    if _place_cache is None:
+        cache = PersistentCache("places")
+        version = _normalizer_version()
+        if cache.get(VERSION_KEY) != version:
+            logger.debug("Place cache is stale; clearing")
+            cache.clear()
+            cache.set(VERSION_KEY, version)
+        _place_cache = cache
+    return _place_cache
 
-    Args:
-        location (str): Input location string.
+
+def _cached_places(keys):
+    """
+    Look `keys` up in the memory cache, then in the persistent cache.
 
     Returns:
-        dict: A dictionary containing matched place name, score, and other extracted details.
+        dict: Cache key to the cached normalization result.
     """
-    if not location or location.lower() == "unknown":
-        print(f"DEBUG: Location '{location}' is unknown or empty. Returning default.")
-        return {
-            "matched_place": "Unknown",
-            "score": 0,
-            "geograpy_data": {},
-            "fuzzy_match": {},
-        }
+    found = {}
+    disk_keys = []
+    with _cache_lock:
+        for key in keys:
+            if key in _memory_cache:
+                _memory_cache.move_to_end(key)
+                found[key] = _memory_cache[key]
+                place_cache_stats["memory_hits"] += 1
+            else:
+                disk_keys.append(key)
 
-    try:
-        # Use geograpy to extract places from the input
-        places = geograpy.get_place_context(text=location)
+    cache = _cache()
+    for key in disk_keys:
+        result = cache.get(key)
+        if result is None:
+            place_cache_stats["misses"] += 1
+            continue
+        place_cache_stats["disk_hits"] += 1
+        found[key] = result
+        _remember(key, result)
+    return found
 
-        # Log all geograpy results for clarity
-        geograpy_data = {
-            "countries": places.countries,
-            "regions": places.regions,
-            "cities": places.cities,
-            "other": places.other,
-        }
-        print(f"DEBUG: Geograpy data extracted from '{location}': {geograpy_data}")
-
-        # Initialize return data structure
-        result = {
-            "geograpy_data": geograpy_data,
-            "fuzzy_match": {},
-            "matched_place": "Unknown",
-            "score": 0,
-        }
 
-        # If Geograpy finds a country, return it as a match
-        if places.countries:
-            country = places.countries[0]
-            print(
-                f"DEBUG: Country '{country}' identified by geograpy. Using as the matched place."
-            )
-            result["matched_place"] = country
-            result["score"] = 100
-            return result
-
-        # If Geograpy identifies a city, use fuzzy matching to standardize
-        if places.cities:
-            city = places.cities[0]
-            match, score, _ = process.extractOne(city, known_places)
-            print(f"DEBUG: Fuzzy match for city '{city}': {match}, Score: {score}")
-            result["fuzzy_match"] = {"type": "city", "match": match, "score": score}
-            if score > 80:
-                result["matched_place"] = match
-                result["score"] = score
-                return result
-
-        # Fallback: Check country_codes.csv if Geograpy fails to identify
-        country_from_csv = country_code_dict.get(location.upper(), None)
-        if country_from_csv:
-            country_name = country_from_csv.split(",")[
-                0
-            ]  # Extract the full country name
-            print(
-                f"DEBUG: Fallback to country_codes.csv for location '{location}': Matched country '{country_name}'."
+def _remember(key, result):
+    with _cache_lock:
+        _memory_cache[key] = result
+        _memory_cache.move_to_end(key)
+        while len(_memory_cache) > PLACE_MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+
+
+def _store_places(results):
+    """
+    Write freshly normalized locations into both cache layers.
+    """
+    cache = _cache()
+    for key, result in results.items():
+        cache.set(key, result)
+        _remember(key, result)
+
+
+def clear_place_cache():
+    """
+    Drop every cached normalization result, in memory and on disk.
+    """
+    with _cache_lock:
+        _memory_cache.clear()
+    _cache().clear()
+    _cache().set(VERSION_KEY, _normalizer_version())
+
+
+def _first_token_prefix(name):
+    """
+    Fuzzy bucket of a normalized name: the leading characters of its first token.
+    """
+    return name.split(" ", 1)[0][:FIRST_TOKEN_PREFIX]
+
+
+def _get_fuzzy_index():
+    """
+    Bucket every gazetteer place name by the prefix of its first token.
+
+    Returns:
+        dict: Prefix to a (normalized names, (name, country) pairs) tuple.
+    """
+    global _fuzzy_index
+    if _fuzzy_index is None:
+        buckets = defaultdict(lambda: ([], []))
+        for key, place in get_place_extractor().place_names.items():
+            names, places = buckets[_first_token_prefix(key)]
+            names.append(key)
+            places.append(place)
+        _fuzzy_index = dict(buckets)
+    return _fuzzy_index
+
+
+def fuzzy_match_places(locations, score_cutoff=FUZZY_SCORE_CUTOFF):
+    """
+    Fuzzy-match many location strings against every country, region and city
+    name in the gazetteer at once.
+
+    Each comma-separated segment of a location is one query. Queries are
+    grouped by the prefix of their first token and each group is scored
+    against the names sharing that prefix with one multi-threaded
+    rapidfuzz.process.cdist call. Queries of up to SHORT_QUERY_LENGTH
+    characters must score at least SHORT_QUERY_SCORE_CUTOFF.
+
+    Returns:
+        dict: Location to a (matched name, country, score) tuple, for the
+        locations with a segment scoring at least `score_cutoff`.
+    """
+    index = _get_fuzzy_index()
+    segments_by_bucket = defaultdict(dict)
+    for location in dict.fromkeys(locations):
+        for segment in SEGMENT_PATTERN.split(location or ""):
+            query = " ".join(normalize_tokens(segment))
+            if query:
+                bucket = segments_by_bucket[_first_token_prefix(query)]
+                bucket.setdefault(query, []).append(location)
+
+    matches = {}
+    for prefix, queries in segments_by_bucket.items():
+        if prefix not in index:
+            continue
+        names, places = index[prefix]
+        scores = process.cdist(
+            list(queries),
+            names,
+            scorer=fuzz.ratio,
+            score_cutoff=score_cutoff,
+            workers=-1,
+        )
+        for row, (query, query_locations) in zip(scores, queries.items()):
+            best = int(row.argmax())
+            score = float(row[best])
+            cutoff = score_cutoff
+            if len(query) <= SHORT_QUERY_LENGTH:
+                cutoff = max(cutoff, SHORT_QUERY_SCORE_CUTOFF)
+            if score < cutoff:
+                continue
+            name, country = places[best]
+            for location in query_locations:
+                if location not in matches or score > matches[location][2]:
+                    matches[location] = (name, country, score)
+    return matches
+
+
+def _normalize_exact(location):
+    """
+    Resolve a location through the place extractor and the country code
+    table, without fuzzy matching.
+    """
+    # Match the location against the gazetteer's countries, regions and cities
+    result = extract_place(location)
+    logger.debug(f"Places extracted from '{location}': {result['geograpy_data']}")
+
+    # A country, region or city resolved to its country is used as the match
+    if result["matched_place"] != "Unknown":
+        logger.debug(
+            f"'{location}' resolved to '{result['matched_place']}' (Score: {result['score']})"
+        )
+        return result
+
+    # Fallback: Check country_codes.csv if no place was extracted
+    country_codes = get_gazetteer().country_codes()
+    country_from_csv = country_codes.get(location.upper(), None)
+    if country_from_csv:
+        country_name = country_from_csv.split(",")[0]  # Extract the full country name
+        logger.debug(
+            f"Fallback to country_codes.csv for location '{location}': Matched country '{country_name}'."
+        )
+        result["matched_place"] = country_name
+        result["score"] = 100
+    return result
+
+
+def normalize_places(locations):
+    """
+    Normalize every unique location string of a scan in one batch.
+
+    Locations are read through an in-memory LRU and the persistent "places"
+    cache, keyed by location_key. The rest are resolved exactly and those
+    left unresolved are fuzzy-matched together against the gazetteer.
+
+    Args:
+        locations (iterable): Location strings; None and duplicates are fine.
+
+    Returns:
+        dict: Location string to the dict normalize_place returns for it.
+    """
+    keys = {}
+    for location in dict.fromkeys(locations):
+        key = location_key(location or "")
+        if key and key != "unknown":
+            keys[location] = key
+    # One representative location string per cache key
+    pending = {key: location for location, key in keys.items()}
+    cached = _cached_places(pending)
+    computed = _normalize_uncached(
+        location for key, location in pending.items() if key not in cached
+    )
+
+    cached.update((keys[location], result) for location, result in computed.items())
+    if geocoding_enabled():
+        computed.update(
+            _geocode_unresolved(
+                {location: cached[key] for key, location in pending.items()}
             )
-            result["matched_place"] = country_name
-            result["score"] = 100
-            return result
+        )
+        cached.update((keys[location], result) for location, result in computed.items())
+    _store_places({keys[location]: result for location, result in computed.items()})
+    logger.debug(
+        f"Normalized {len(pending)} locations, {len(computed)} not cached "
+        f"(cache stats: {place_cache_stats})"
+    )
+    return {location: cached[key] for location, key in keys.items()}
+
+
+def _normalize_uncached(locations):
+    """
+    Normalize locations without the cache: exact matching first, then one
+    batched fuzzy match over everything left unresolved.
+    """
+    results = {}
+    unresolved = []
+    for location in locations:
+        try:
+            results[location] = _normalize_exact(location)
+        except Exception as e:
+            logger.error(f"Error in normalizing place: {e}")
+            results[location] = _empty_result()
+            continue
+        result = results[location]
+        # Leftover words next to a weak or missing match may be a misspelled
+        # place; words on the ignore list ("Earth") are not left over
+        if result["score"] < COUNTRY_SCORE and result["geograpy_data"].get("other"):
+            unresolved.append(location)
 
-        # If all else fails, apply fuzzy matching directly on the input location
-        match, score, _ = process.extractOne(location, known_places)
-        print(f"DEBUG: Fuzzy match for location '{location}': {match}, Score: {score}")
+    # If all else fails, apply fuzzy matching directly on the input locations
+    for location, (match, country, score) in fuzzy_match_places(unresolved).items():
+        logger.debug(f"Fuzzy match for location '{location}': {match}, Score: {score}")
+        result = results[location]
+        if score <= result["score"]:
+            continue
         result["fuzzy_match"] = {"type": "direct", "match": match, "score": score}
-        if score > 80:
-            result["matched_place"] = match
-            result["score"] = score
+        result["matched_place"] = country
+        result["score"] = score
+    return results
 
-        return result
-    except Exception as e:
-        print(f"Error in normalizing place: {e}")
-        return {
-            "matched_place": "Unknown",
-            "score": 0,
-            "geograpy_data": {},
-            "fuzzy_match": {},
+
+def _geocode_unresolved(results):
+    """
+    Geocode the locations of `results` that are still unknown but have words
+    left over, and return the results this resolved. Failed requests are
+    not recorded, so they are retried on a later scan.
+    """
+    unresolved = [
+        location
+        for location, result in results.items()
+        if result["matched_place"] == "Unknown"
+        and result["geograpy_data"].get("other")
+        and not result["fuzzy_match"]
+    ]
+    if not unresolved:
+        return {}
+
+    country_names = get_place_extractor().country_names
+    resolved = {}
+    for location, (code, display_name) in geocode_locations(unresolved).items():
+        country = country_names.get(code)
+        result = dict(results[location])
+        # Remember a completed lookup even without a country, so it is not repeated
+        result["fuzzy_match"] = {
+            "type": "geocode",
+            "match": display_name,
+            "score": GEOCODE_SCORE if country else 0,
         }
+        if country:
+            logger.debug(f"Geocoded location '{location}': {display_name}")
+            result["matched_place"] = country
+            result["score"] = GEOCODE_SCORE
+        resolved[location] = result
+    return resolved
+
+
+def normalize_place(location):
+    """
+    Normalize a location string by first extracting place names with the
+    gazetteer-based place extractor, then using country_codes.csv or fuzzy
+    matching as a fallback.
+
+    Args:
+        location (str): Input location string.
+
+    Returns:
+        dict: A dictionary containing matched place name, score, and other extracted details.
+    """
+    if location_key(location or "") in ("", "unknown"):
+        logger.debug(f"Location '{location}' is unknown or empty. Returning default.")
+        return _empty_result()
+    return normalize_places([location])[location]
 
 
 # Test cases for debugging
 if __name__ == "__main__":
-    print(normalize_place("nyc"))  # Expected: New York City
-    print(normalize_place("ny, ny"))  # Expected: New York City
-    print(normalize_place("New York City"))  # Expected: New York City
-    print(normalize_place("Austin, Texas"))  # Expected: Austin, Texas
-    print(normalize_place("L.A."))  # Expected: Los Angeles
-    print(normalize_place("Luxemburg"))  # Expected: Luxemburg
+    print(normalize_place("nyc"))  # Expected: United States
+    print(normalize_place("ny, ny"))  # Expected: United States
+    print(normalize_place("New York City"))  # Expected: United States
+    print(normalize_place("Austin, Texas"))  # Expected: United States
+    print(normalize_place("L.A."))  # Expected: United States
+    print(normalize_place("Luxemburg"))  # Expected: Luxembourg
     print(normalize_place("Unknown"))  # Expected: Unknown, 0
     print(normalize_place("Anahola, HI"))  # Expected: Handle city and state
-    print(normalize_place("United States"))  # Expected: United States of America
-    print(normalize_place("NL"))  # Expected: Netherlands from fallback
+    print(normalize_place("United States"))  # Expected: United States
+    print(normalize_place("NL"))  # Expected: Netherlands
+    print(normalize_place("San Fransisco"))  # Expected: United States via fuzzy match
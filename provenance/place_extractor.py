@@ -0,0 +1,286 @@
+import re
+import csv
+import logging
+import threading
+import unicodedata
+from utils.gazetteer import get_gazetteer
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+PLACE_ALIASES_PATH = "data/place_aliases.csv"
+CCTLD_PATH = "data/cctlds.csv"
+
+# Scores on normalize_place's 0-100 scale for each kind of evidence
+COUNTRY_SCORE = 100
+REGION_SCORE = 90
+CITY_SCORE = 85
+
+# Shorter city names are mostly noise ("Of", "Ai") in free-form locations
+MIN_CITY_NAME_LENGTH = 3
+
+SEGMENT_PATTERN = re.compile(r"[,;/|()\n]+|\s+-\s+")
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+ABBREVIATION_DOT = re.compile(r"(?<=\w)\.(?=\w)")
+
+_ENTRIES = "$"
+
+
+def normalize_tokens(text):
+    """
+    Lowercase `text`, strip accents, join dotted abbreviations ("L.A." ->
+    "la") and split it into word tokens.
+    """
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return TOKEN_PATTERN.findall(ABBREVIATION_DOT.sub("", text))
+
+
+class PlaceExtractor:
+    """
+    Multi-pattern matcher over normalized tokens for every country, region
+    and city name in the gazetteer, plus the aliases in place_aliases.csv.
+
+    Patterns are stored in a token trie and matched leftmost-longest in one
+    pass over the location, so "New York City" wins over "New York" and
+    "York". Two-letter codes ("NY", "NL") only count when they make up a
+    whole comma-separated segment.
+    """
+
+    def __init__(self, gazetteer=None):
+        self.gazetteer = gazetteer or get_gazetteer()
+        self._trie = {}
+        # name_key -> [(name, country, state, state_code)], most prominent first
+        self._cities = {}
+        # name_key -> (name, country) for every country, region and city name
+        self.place_names = {}
+        # Uppercased ISO country code -> country name as used in world_cities.csv
+        self.country_names = {}
+        self._build()
+
+    def _add(self, name, entry):
+        tokens = normalize_tokens(name)
+        if not tokens:
+            return
+        key = " ".join(tokens)
+        kind = entry[0]
+        if kind in ("country", "region") and len(key) >= MIN_CITY_NAME_LENGTH:
+            # Countries are added first, so they win over same-named regions
+            place = entry[1] if kind == "country" else entry[1][0]
+            country = entry[1] if kind == "country" else entry[1][2]
+            self.place_names.setdefault(key, (place, country))
+        node = self._trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        entries = node.setdefault(_ENTRIES, [])
+        if entry not in entries:
+            entries.append(entry)
+
+    def _build(self):
+        # Country names follow world_cities.csv ("Russia", not "Russian Federation")
+        short_names = {}
+        with open(CCTLD_PATH, newline="", encoding="utf-8") as csvfile:
+            reader = csv.reader(csvfile)
+            next(reader, None)  # Skip header row
+            for tld, country in reader:
+                short_names[tld.upper()] = country
+                self.country_names[tld.upper()] = country
+                self._add(country, ("country", country))
+        for code, name in self.gazetteer.country_codes().items():
+            country = short_names.get(code, name)
+            if code == "UK":
+                country = short_names["GB"]
+            self._add(name, ("country", country))
+            self._add(code, ("country_code", country))
+            self.country_names[code] = country
+
+        for name, code, country in self.gazetteer.iter_regions():
+            self._add(name, ("region", (name, code, country)))
+            if code:
+                self._add(code, ("region_code", (name, code, country)))
+
+        for name, country, state, state_code, rank in sorted(
+            self.gazetteer.iter_cities(), key=lambda row: row[4]
+        ):
+            self._add(country, ("country", country))
+            key = " ".join(normalize_tokens(name))
+            if len(key) < MIN_CITY_NAME_LENGTH:
+                continue
+            self._cities.setdefault(key, []).append((name, country, state, state_code))
+            self.place_names.setdefault(key, (name, country))
+            self._add(name, ("city", key))
+
+        with open(PLACE_ALIASES_PATH, newline="", encoding="utf-8") as csvfile:
+            rows = csv.reader(
+                line for line in csvfile if not line.lstrip().startswith("#")
+            )
+            next(rows, None)  # Skip header row
+            for alias, place, kind, *country in rows:
+                if kind == "city":
+                    key = " ".join(normalize_tokens(place))
+                    self._add(alias, ("city", key, country[0] if country else None))
+                else:
+                    self._add(alias, (kind, place))
+                if kind == "ignore":
+                    self.place_names.pop(" ".join(normalize_tokens(alias)), None)
+        logger.debug(f"Built place extractor over {len(self._cities)} city names")
+
+    def _matches(self, location):
+        """
+        Yield (entries, matched text, whole segment) for each leftmost-longest
+        pattern match in `location`, and empty entries for unmatched tokens.
+        """
+        for segment in SEGMENT_PATTERN.split(location):
+            tokens = normalize_tokens(segment)
+            i = 0
+            while i < len(tokens):
+                node = self._trie
+                end, entries = None, None
+                for j in range(i, len(tokens)):
+                    node = node.get(tokens[j])
+                    if node is None:
+                        break
+                    if _ENTRIES in node:
+                        end, entries = j + 1, node[_ENTRIES]
+                if entries is None:
+                    yield (), tokens[i], False
+                    i += 1
+                    continue
+                whole_segment = i == 0 and end == len(tokens)
+                yield entries, " ".join(tokens[i:end]), whole_segment
+                i = end
+
+    def extract(self, location):
+        """
+        Extract the countries, regions and cities mentioned in `location`
+        and resolve them to a single country.
+
+        Returns:
+            dict: Same shape as normalize_place: matched_place (a country or
+            "Unknown"), score, geograpy_data with the countries, regions,
+            cities and other (unmatched) text found, and an empty fuzzy_match.
+        """
+        countries, code_countries = [], []
+        regions, code_regions = [], []
+        cities = []
+        other = []
+
+        for entries, text, whole_segment in self._matches(location or ""):
+            if any(entry[0] == "ignore" for entry in entries):
+                continue
+            found = False
+            for entry in entries:
+                kind = entry[0]
+                if kind == "country":
+                    countries.append(entry[1])
+                elif kind == "region":
+                    regions.append(entry[1])
+                elif kind == "city":
+                    cities.append(entry[1:])
+                elif whole_segment and kind == "country_code":
+                    code_countries.append(entry[1])
+                elif whole_segment and kind == "region_code":
+                    code_regions.append(entry[1])
+                else:
+                    continue
+                found = True
+            if not found:
+                other.append(text)
+
+        # A bare two-letter code is usually a US state ("Austin, TX") unless a
+        # city places it in the country with that code ("Pune, IN")
+        city_countries = {
+            candidate[1]
+            for key, *country in cities
+            for candidate in self._cities.get(key, [])
+        }
+        if code_regions and code_countries:
+            if any(c in city_countries for c in code_countries) and not any(
+                region[2] in city_countries for region in code_regions
+            ):
+                code_regions = []
+            else:
+                code_countries = []
+        regions += code_regions
+        countries += code_countries
+
+        # Likewise "Atlanta, Georgia" names the US state, not the country
+        countries = [
+            country
+            for country in countries
+            if country in city_countries
+            or not any(
+                region[0] == country and region[2] in city_countries
+                for region in regions
+            )
+        ]
+
+        city = self._resolve_city(cities, countries, regions)
+        if countries:
+            matched_place, score = countries[0], COUNTRY_SCORE
+        elif regions:
+            region = regions[0]
+            if city:
+                region = next((r for r in regions if r[2] == city[1]), region)
+            matched_place, score = region[2], REGION_SCORE
+        elif city:
+            matched_place, score = city[1], CITY_SCORE
+        else:
+            matched_place, score = "Unknown", 0
+
+        return {
+            "matched_place": matched_place,
+            "score": score,
+            "geograpy_data": {
+                "countries": list(dict.fromkeys(countries)),
+                "regions": list(dict.fromkeys(region[0] for region in regions)),
+                "cities": [city[0]] if city else [],
+                "other": other,
+            },
+            "fuzzy_match": {},
+        }
+
+    def _resolve_city(self, cities, countries, regions):
+        """
+        Pick the most prominent candidate of the matched city names that is
+        consistent with the matched countries and regions. Aliases come
+        first, so "Roma" is Rome, Italy rather than Roma, Texas, unless the
+        location names Texas.
+        """
+        region_names = {region[0] for region in regions}
+        region_countries = {region[2] for region in regions}
+        best = None
+        # Gazetteer entries are (key,); alias entries are (key, country)
+        for key, *alias_country in sorted(cities, key=len, reverse=True):
+            candidates = self._cities.get(key, [])
+            if alias_country and alias_country[0]:
+                candidates = [c for c in candidates if c[1] == alias_country[0]]
+            for candidate in candidates:
+                name, country, state, _ = candidate
+                if state in region_names or country in countries:
+                    return candidate
+                if not countries and (not regions or country in region_countries):
+                    best = best or candidate
+        return best
+
+
+_extractor = None
+_extractor_lock = threading.Lock()
+
+
+def get_place_extractor():
+    """
+    Return the process-wide PlaceExtractor, building it on first use.
+    """
+    global _extractor
+    with _extractor_lock:
+        if _extractor is None:
+            _extractor = PlaceExtractor()
+        return _extractor
+
+
+def extract_place(location):
+    """
+    Extract and resolve the places mentioned in a free-form location string.
+    """
+    return get_place_extractor().extract(location)
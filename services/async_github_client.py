@@ -0,0 +1,370 @@
+import re
+import json
+import queue
+import asyncio
+import logging
+import threading
+from urllib.parse import urlencode
+import aiohttp
+from services.github_client import (
+    GITHUB_GRAPHQL_URL,
+    COMMIT_HISTORY_QUERY,
+    GRAPHQL_PAGE_SIZE,
+    RATE_LIMIT_MAX_RETRIES,
+    GraphQLError,
+    token_pool,
+    is_rate_limited,
+    get_http_cache,
+    http_cache_refresh_requested,
+    commit_record_from_node,
+)
+from services.profile_service import get_cached_profiles, store_profiles
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_ACCEPT = "application/vnd.github+json"
+
+# Requests in flight at once; keep-alive connections are pooled up to this size
+ASYNC_CONCURRENCY = 32
+ASYNC_TIMEOUT = 60
+# Transient server errors are retried with exponential backoff, like the
+# urllib3 Retry of the synchronous client
+SERVER_ERROR_STATUSES = (500, 502, 503, 504)
+SERVER_ERROR_MAX_RETRIES = 3
+SERVER_ERROR_BACKOFF = 1.0
+# Pages of commit records fetched ahead of the consumer of iter_commit_histories
+HISTORY_QUEUE_PAGES = 8
+
+LAST_PAGE_PATTERN = re.compile(r'[?&]page=(\d+)[^>]*>;\s*rel="last"')
+
+
+def last_page_number(link_header):
+    """
+    Read the number of the last page from a GitHub Link header.
+    """
+    match = LAST_PAGE_PATTERN.search(link_header or "")
+    return int(match.group(1)) if match else 1
+
+
+def profile_from_rest_user(login, user):
+    """
+    Convert a REST /users/<login> payload into the contributor dict consumed by
+    `identify_geography_dict`.
+    """
+    user = user or {}
+    return {
+        "login": user.get("login") or login,
+        "node_id": user.get("node_id"),
+        "name": user.get("name"),
+        "email": user.get("email") or None,
+        "location": user.get("location"),
+        "company": user.get("company"),
+    }
+
+
+class AsyncGitHubClient:
+    """
+    Asyncio GitHub client that overlaps many round trips on one pooled,
+    keep-alive aiohttp session.
+
+    Concurrency is bounded by a semaphore, tokens and pacing come from the
+    shared token_pool, and GET responses go through the same on-disk cache as
+    the PyGithub transport.
+    """
+
+    def __init__(self, concurrency=ASYNC_CONCURRENCY):
+        self.concurrency = concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._session = None
+
+    async def __aenter__(self):
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=self.concurrency, keepalive_timeout=30
+            ),
+            timeout=aiohttp.ClientTimeout(total=ASYNC_TIMEOUT),
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._session.close()
+
+    async def _send(self, method, url, resource, auth_scheme, **kwargs):
+        headers = dict(kwargs.pop("headers", {}))
+        server_errors = 0
+        async with self._semaphore:
+            attempt = 0
+            while attempt <= RATE_LIMIT_MAX_RETRIES:
+                token, delay = token_pool.reserve(resource)
+                if delay > 0:
+                    logger.warning(
+                        f"GitHub {resource} rate limit: waiting {delay:.1f}s"
+                    )
+                    await asyncio.sleep(delay)
+                headers["Authorization"] = f"{auth_scheme} {token}"
+                async with self._session.request(
+                    method, url, headers=headers, **kwargs
+                ) as response:
+                    status = response.status
+                    response_headers = dict(response.headers)
+                    body = await response.text()
+                token_pool.update(token, response_headers, status, resource)
+                if (
+                    status in SERVER_ERROR_STATUSES
+                    and server_errors < SERVER_ERROR_MAX_RETRIES
+                ):
+                    delay = SERVER_ERROR_BACKOFF * 2**server_errors
+                    server_errors += 1
+                    logger.warning(
+                        f"GitHub returned HTTP {status} for {url}, retrying in {delay:.0f}s"
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                if not is_rate_limited(status, response_headers):
+                    break
+                attempt += 1
+                logger.warning(f"Rate limited on {url}, attempt {attempt}")
+        return status, response_headers, body
+
+    async def get_json(self, path, params=None):
+        """
+        GET a REST endpoint, reading through the shared response cache.
+
+        Returns:
+            tuple: (decoded JSON body, response headers)
+        """
+        url = f"{GITHUB_API_URL}{path}"
+        if params:
+            url = f"{url}?{urlencode(params)}"
+        headers = {"Accept": GITHUB_ACCEPT}
+        cache = get_http_cache()
+        key = f"{url}|{GITHUB_ACCEPT}"
+
+        entry = cache.get_entry(key) if cache is not None else None
+        if entry is not None:
+            cached = entry["value"]
+            if not entry["expired"] and not http_cache_refresh_requested():
+                return _decode(cached["body"]), cached["headers"]
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        status, response_headers, body = await self._send(
+            "GET", url, "core", "token", headers=headers
+        )
+        if status == 304 and entry is not None:
+            cache.touch(key)
+            return _decode(entry["value"]["body"]), entry["value"]["headers"]
+        if status == 404:
+            return None, response_headers
+        if status >= 400:
+            raise aiohttp.ClientResponseError(
+                None, (), status=status, message=body[:200]
+            )
+
+        if cache is not None and status == 200:
+            etag = response_headers.get("ETag")
+            last_modified = response_headers.get("Last-Modified")
+            if etag or last_modified:
+                cache.set(
+                    key,
+                    {
+                        "headers": response_headers,
+                        "body": body,
+                        "etag": etag,
+                        "last_modified": last_modified,
+                    },
+                )
+        return _decode(body), response_headers
+
+    async def graphql(self, query, variables=None):
+        """
+        Execute a GraphQL query and return its `data` member.
+        """
+        status, _, body = await self._send(
+            "POST",
+            GITHUB_GRAPHQL_URL,
+            "graphql",
+            "bearer",
+            json={"query": query, "variables": variables or {}},
+        )
+        if status >= 400:
+            raise aiohttp.ClientResponseError(
+                None, (), status=status, message=body[:200]
+            )
+        payload = _decode(body)
+        errors = payload.get("errors")
+        data = payload.get("data")
+        if errors and not data:
+            raise GraphQLError(errors[0].get("message", "Unknown GraphQL error"))
+        return data or {}
+
+    async def get_paginated(self, path, params=None):
+        """
+        Fetch every page of a REST listing. The first page reveals the page
+        count through its Link header; the rest are requested concurrently.
+        A page that still fails after retries is logged and skipped.
+        """
+        params = dict(params or {}, per_page=100, page=1)
+        first, headers = await self.get_json(path, params)
+        last = last_page_number(headers.get("Link") or headers.get("link"))
+        pages = await asyncio.gather(
+            *(
+                self.get_json(path, dict(params, page=page))
+                for page in range(2, last + 1)
+            ),
+            return_exceptions=True,
+        )
+        items = list(first or [])
+        for number, page in enumerate(pages, start=2):
+            if isinstance(page, BaseException):
+                logger.error(f"Error fetching page {number} of {path}: {page}")
+                continue
+            items.extend(page[0] or [])
+        return items
+
+    async def list_contributor_logins(self, owner, repo_name):
+        contributors = await self.get_paginated(
+            f"/repos/{owner}/{repo_name}/contributors"
+        )
+        return [c["login"] for c in contributors if c.get("login")]
+
+    async def get_user_profile(self, login):
+        user, _ = await self.get_json(f"/users/{login}")
+        return profile_from_rest_user(login, user)
+
+    async def iter_commit_pages(
+        self, owner, repo_name, author_id=None, since=None
+    ):
+        """
+        Yield an author's commit records, newest first, with additions and
+        deletions, one GraphQL page (a list of records) at a time.
+        """
+        variables = {
+            "owner": owner,
+            "name": repo_name,
+            "first": GRAPHQL_PAGE_SIZE,
+            "cursor": None,
+            "author": {"id": author_id} if author_id else None,
+            "since": since.isoformat() if since else None,
+        }
+        while True:
+            data = await self.graphql(COMMIT_HISTORY_QUERY, variables)
+            branch = (data.get("repository") or {}).get("defaultBranchRef")
+            if not branch:
+                return
+            history = branch["target"]["history"]
+            yield [commit_record_from_node(node) for node in history["nodes"]]
+            if not history["pageInfo"]["hasNextPage"]:
+                return
+            variables["cursor"] = history["pageInfo"]["endCursor"]
+
+
+def _decode(body):
+    return json.loads(body) if body else None
+
+
+async def fetch_repository_async(owner, repo_name, concurrency=ASYNC_CONCURRENCY):
+    """
+    Fetch contributors and their profiles with all requests of each stage in
+    flight at the same time. Contributors whose profile cannot be fetched
+    are logged and skipped.
+
+    Returns:
+        list: Contributor dicts, in contribution order.
+    """
+    async with AsyncGitHubClient(concurrency) as client:
+        logins = await client.list_contributor_logins(owner, repo_name)
+        logger.debug(f"Fetched {len(logins)} contributors for {owner}/{repo_name}")
+        # Only profiles missing from the shared profile cache are requested
+        profiles = get_cached_profiles(logins)
+        missing = [login for login in logins if login not in profiles]
+        fetched = await asyncio.gather(
+            *(client.get_user_profile(login) for login in missing),
+            return_exceptions=True,
+        )
+        for login, profile in zip(missing, fetched):
+            if isinstance(profile, BaseException):
+                logger.error(f"Error fetching profile for {login}: {profile}")
+            else:
+                profiles[login] = profile
+        store_profiles(profiles[login] for login in missing if login in profiles)
+    return [profiles[login] for login in logins if login in profiles]
+
+
+def fetch_repository(owner, repo_name, concurrency=ASYNC_CONCURRENCY):
+    """
+    Synchronous entry point for fetch_repository_async.
+    """
+    return asyncio.run(fetch_repository_async(owner, repo_name, concurrency))
+
+
+def iter_commit_histories(
+    owner, repo_name, authors, since_for=None, concurrency=ASYNC_CONCURRENCY
+):
+    """
+    Stream the commit records of many authors while all their histories are
+    paged through concurrently on an event loop in a background thread.
+
+    Records of different authors arrive interleaved, each author's newest
+    first. At most HISTORY_QUEUE_PAGES pages wait for the consumer, so memory
+    stays flat however long the histories are. An author whose history
+    cannot be fetched is logged and skipped.
+
+    Args:
+        authors (list): Contributor dicts with `login` and `node_id`.
+        since_for (callable): Optional function mapping a login to the date
+            from which to fetch that contributor's commits.
+    """
+    pages = queue.Queue(maxsize=HISTORY_QUEUE_PAGES)
+    stopped = threading.Event()
+    done = object()
+
+    async def fetch_author(client, profile):
+        since = since_for(profile["login"]) if since_for else None
+        try:
+            async for records in client.iter_commit_pages(
+                owner, repo_name, profile["node_id"], since=since
+            ):
+                if stopped.is_set():
+                    return
+                # Blocks while the consumer is behind, pausing this history
+                await asyncio.get_running_loop().run_in_executor(
+                    None, pages.put, records
+                )
+        except Exception as e:
+            logger.error(f"Error fetching commits for {profile['login']}: {e}")
+
+    async def fetch_all():
+        async with AsyncGitHubClient(concurrency) as client:
+            await asyncio.gather(
+                *(fetch_author(client, p) for p in authors), return_exceptions=True
+            )
+
+    def run():
+        try:
+            asyncio.run(fetch_all())
+        except Exception as e:
+            logger.error(f"Error fetching commit histories for {owner}/{repo_name}: {e}")
+        finally:
+            pages.put(done)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    try:
+        while True:
+            records = pages.get()
+            if records is done:
+                return
+            yield from records
+    finally:
+        # Release producers blocked on a full queue if the consumer stopped early
+        stopped.set()
+        while thread.is_alive():
+            try:
+                pages.get(timeout=0.1)
+            except queue.Empty:
+                pass
@@ -0,0 +1,147 @@
+import csv
+import logging
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+CCTLD_PATH = "data/cctlds.csv"
+EMAIL_DOMAINS_PATH = "data/email_domains.csv"
+PUBLIC_SUFFIXES_PATH = "data/public_suffixes.txt"
+
+# Marks the end of a suffix in the trie; its value is the country ("" = no signal)
+_COUNTRY = "$"
+
+
+class DomainSuffixTrie:
+    """
+    Trie over domain labels, read right to left, mapping suffixes such as
+    "cn", "ac.uk" or "mail.ru" to a country. The longest matching suffix
+    wins, so a curated "yandex.com" overrides the generic "com".
+    """
+
+    def __init__(self):
+        self._root = {}
+
+    def add(self, suffix, country):
+        node = self._root
+        for label in reversed(suffix.lower().strip(".").split(".")):
+            node = node.setdefault(label, {})
+        node[_COUNTRY] = country
+
+    def match(self, domain):
+        """
+        Return (matched suffix, country) for the longest suffix of `domain`
+        in the trie, or (None, None).
+        """
+        labels = domain.lower().strip(".").split(".")
+        node = self._root
+        found = (None, None)
+        for depth, label in enumerate(reversed(labels), start=1):
+            node = node.get(label)
+            if node is None:
+                break
+            if _COUNTRY in node:
+                found = (".".join(labels[-depth:]), node[_COUNTRY])
+        return found
+
+
+def _read_rows(file_path):
+    """
+    Yield the data rows of a CSV file, skipping the header and '#' comments.
+    """
+    try:
+        with open(file_path, newline="", encoding="utf-8") as csvfile:
+            reader = csv.reader(
+                line for line in csvfile if not line.lstrip().startswith("#")
+            )
+            next(reader, None)  # Skip header row
+            yield from reader
+    except FileNotFoundError as e:
+        logger.error(f"File not found: {file_path}, Error: {e}")
+
+
+def build_country_trie(cctld_path=CCTLD_PATH, email_domains_path=EMAIL_DOMAINS_PATH):
+    """
+    Compile the ccTLD table and the curated domain table into one trie.
+    Curated entries are added last, so they override the ccTLD table.
+    """
+    trie = DomainSuffixTrie()
+    for path in (cctld_path, email_domains_path):
+        for row in _read_rows(path):
+            if row:
+                trie.add(row[0], row[1].strip() if len(row) > 1 else "")
+    logger.debug("Compiled domain country trie")
+    return trie
+
+
+def build_suffix_trie(file_path=PUBLIC_SUFFIXES_PATH):
+    """
+    Compile the list of multi-label public suffixes into a trie.
+    """
+    trie = DomainSuffixTrie()
+    try:
+        with open(file_path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    trie.add(line, "")
+    except FileNotFoundError as e:
+        logger.error(f"File not found: {file_path}, Error: {e}")
+    return trie
+
+
+_country_trie = None
+_suffix_trie = None
+_country_codes = None
+
+
+def _country_index():
+    global _country_trie
+    if _country_trie is None:
+        _country_trie = build_country_trie()
+    return _country_trie
+
+
+def _suffix_index():
+    global _suffix_trie
+    if _suffix_trie is None:
+        _suffix_trie = build_suffix_trie()
+    return _suffix_trie
+
+
+def country_for_code(code):
+    """
+    Return the country name of a two-letter ISO country code, spelled as in
+    the ccTLD table, or None.
+    """
+    global _country_codes
+    if _country_codes is None:
+        _country_codes = {
+            row[0].upper(): row[1] for row in _read_rows(CCTLD_PATH) if len(row) > 1
+        }
+    return _country_codes.get((code or "").upper())
+
+
+def classify_domain(domain):
+    """
+    Attribute an email domain to a country without any network lookup.
+
+    Returns:
+        str or None: The country, or None when the domain is ambiguous (a
+        generic TLD or a generic-use ccTLD such as .io) and needs DNS/WHOIS.
+    """
+    if not domain:
+        return None
+    _, country = _country_index().match(domain)
+    return country or None
+
+
+def registrable_domain(domain):
+    """
+    Reduce a host name to the domain registered under its public suffix,
+    e.g. "mail.corp.co.uk" -> "corp.co.uk", which is what WHOIS knows about.
+    """
+    labels = domain.lower().strip(".").split(".")
+    suffix, _ = _suffix_index().match(domain)
+    suffix_length = len(suffix.split(".")) if suffix else 1
+    return ".".join(labels[-(suffix_length + 1) :])
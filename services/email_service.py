@@ -1,9 +1,22 @@
+import re
+import asyncio
 import dns.resolver
-import whois
+import dns.asyncresolver
 import time
-import signal
+import socket
 import logging
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from whois.parser import WhoisEntry
 from config import logging_config  # Correct path to logging_config
+from utils.cache import PersistentCache
+from services.domain_classifier import (
+    classify_domain,
+    country_for_code,
+    registrable_domain,
+)
+from services.ip_geolocation import ip_country_code
 
 FREE_EMAIL_DOMAINS = [
     "gmail.com",
@@ -19,10 +32,182 @@ FREE_EMAIL_DOMAINS = [
 # Initialize logger using logging_config
 logger = logging.getLogger(__name__)
 
+# MX and WHOIS answers change rarely; failures are retried much sooner
+DOMAIN_CACHE_TTL = 7 * 24 * 60 * 60
+DOMAIN_FAILURE_TTL = 60 * 60
+
+WHOIS_PORT = 43
+WHOIS_TIMEOUT = 10
+WHOIS_RETRY_DELAY = 2
+IANA_WHOIS_SERVER = "whois.iana.org"
+# Registries throttle clients that query them too often
+WHOIS_SERVER_INTERVAL = 1.0
+WHOIS_WORKERS = 8
+
+WHOIS_REFER_PATTERN = re.compile(r"^(?:refer|whois):\s*(\S+)", re.I | re.M)
+WHOIS_REGISTRAR_PATTERN = re.compile(r"Registrar WHOIS Server:[ \t]*(\S+)", re.I)
+
+# Mail hosting providers whose MX hosts are located where the provider runs
+# them, not where the domain's owner is; they are left out of mx_country
+HOSTED_MAIL_MX_SUFFIXES = (
+    "google.com",
+    "googlemail.com",
+    "outlook.com",
+    "hotmail.com",
+    "pphosted.com",
+    "mimecast.com",
+    "messagelabs.com",
+    "barracudanetworks.com",
+    "iphmx.com",
+    "zoho.com",
+    "zoho.eu",
+    "mailgun.org",
+    "sendgrid.net",
+    "amazonaws.com",
+    "secureserver.net",
+    "mailcontrol.com",
+    "trendmicro.com",
+    "fireeyecloud.com",
+    "emailsrvr.com",
+    "messagingengine.com",
+    "protonmail.ch",
+    "icloud.com",
+    "yandex.net",
+    "mail.ru",
+)
+
+# Defaults for batched MX resolution; override with configure_dns
+DNS_CONCURRENCY = 64
+DNS_TIMEOUT = 5.0
+
+_dns_settings = {
+    "nameservers": None,
+    "port": 53,
+    "concurrency": DNS_CONCURRENCY,
+    "timeout": DNS_TIMEOUT,
+}
+_dns_resolver = None
+
+_whois_servers = {}
+_whois_next_slot = {}
+_whois_lock = threading.Lock()
+
+_domain_cache = None
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def _cache():
+    global _domain_cache
+    if _domain_cache is None:
+        _domain_cache = PersistentCache("domains", ttl=DOMAIN_CACHE_TTL)
+    return _domain_cache
+
+
+def cached_domain_lookup(kind, domain, lookup, failed):
+    """
+    Run `lookup(domain)` at most once per TTL across runs and threads.
+
+    Concurrent callers asking for the same record wait for the first caller's
+    result instead of repeating the lookup. Results for which `failed` returns
+    True are cached too, but only for DOMAIN_FAILURE_TTL.
+
+    Args:
+        kind (str): Record kind, e.g. "mx" or "whois"; part of the cache key.
+        domain (str): Domain to look up.
+        lookup (callable): Performs the uncached lookup; must return JSON data.
+        failed (callable): Tells whether a lookup result is a failure.
+    """
+    key = _domain_key(kind, domain)
+    cache = _cache()
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = _inflight[key] = Future()
+    if not leader:
+        return future.result()
+
+    try:
+        # Another thread may have stored it between the cache read and the lock
+        value = cache.get(key)
+        if value is None:
+            value = lookup(domain)
+            _store_domain_record(kind, domain, value, failed)
+        future.set_result(value)
+        return value
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+def _domain_key(kind, domain):
+    return f"{kind}:{domain.lower()}"
+
+
+def _store_domain_record(kind, domain, value, failed):
+    ttl = DOMAIN_FAILURE_TTL if failed(value) else None
+    _cache().set(_domain_key(kind, domain), value, ttl=ttl)
+
+
+def configure_dns(nameservers=None, port=None, concurrency=None, timeout=None):
+    """
+    Configure the resolvers used for MX lookups.
+
+    Args:
+        nameservers (list): Nameserver addresses to query instead of the
+            system resolvers.
+        port (int): Port of those nameservers.
+        concurrency (int): Queries in flight at once in mx_lookup_many.
+        timeout (float): Seconds allowed per query, retries included.
+    """
+    global _dns_resolver
+    if nameservers:
+        _dns_settings["nameservers"] = list(nameservers)
+    if port is not None:
+        _dns_settings["port"] = port
+    if concurrency is not None:
+        _dns_settings["concurrency"] = concurrency
+    if timeout is not None:
+        _dns_settings["timeout"] = timeout
+    _dns_resolver = None
+
+
+def _configure_resolver(resolver, timeout=None):
+    if _dns_settings["nameservers"]:
+        resolver.nameservers = _dns_settings["nameservers"]
+    resolver.port = _dns_settings["port"]
+    resolver.lifetime = timeout or _dns_settings["timeout"]
+    return resolver
+
+
+def _resolver():
+    global _dns_resolver
+    if _dns_resolver is None:
+        _dns_resolver = _configure_resolver(
+            dns.resolver.Resolver(configure=not _dns_settings["nameservers"])
+        )
+    return _dns_resolver
+
+
+def _mx_failed(mx_records):
+    return not mx_records
+
+
+def _addr_failed(addresses):
+    return not addresses
+
 
 def dns_mx_lookup(email_domain):
     try:
-        mx_records = dns.resolver.resolve(email_domain, "MX")
+        mx_records = _resolver().resolve(email_domain, "MX")
         return [str(r.exchange) for r in mx_records]
     except dns.resolver.NoAnswer as e:
         # Log to app.log (always) and console (only on -vvv)
@@ -34,27 +219,84 @@ def dns_mx_lookup(email_domain):
         return []
 
 
-# Timeout handler for signal
-def timeout_handler(signum, frame):
-    raise TimeoutError
+def _whois_query(server, query, timeout=WHOIS_TIMEOUT):
+    """
+    Send one query to a WHOIS server over port 43 and return the raw answer.
+    The socket timeout bounds every connect and read, from any thread.
+    """
+    _wait_for_server(server)
+    with socket.create_connection((server, WHOIS_PORT), timeout=timeout) as sock:
+        sock.sendall(f"{query}\r\n".encode("idna"))
+        chunks = []
+        while True:
+            data = sock.recv(4096)
+            if not data:
+                break
+            chunks.append(data)
+    return b"".join(chunks).decode("utf-8", errors="replace")
+
+
+def _wait_for_server(server):
+    """
+    Space queries to one WHOIS server at least WHOIS_SERVER_INTERVAL apart.
+    Each caller reserves the next free slot, then sleeps outside the lock.
+    """
+    with _whois_lock:
+        now = time.monotonic()
+        slot = max(now, _whois_next_slot.get(server, now))
+        _whois_next_slot[server] = slot + WHOIS_SERVER_INTERVAL
+    if slot > now:
+        time.sleep(slot - now)
+
+
+def _whois_server_for(domain, timeout=WHOIS_TIMEOUT):
+    """
+    Find the WHOIS server of a domain's TLD through the IANA referral.
+    """
+    tld = domain.rsplit(".", 1)[-1].lower()
+    with _whois_lock:
+        if tld in _whois_servers:
+            return _whois_servers[tld]
+    answer = _whois_query(IANA_WHOIS_SERVER, tld, timeout)
+    match = WHOIS_REFER_PATTERN.search(answer)
+    server = match.group(1).strip() if match else None
+    with _whois_lock:
+        _whois_servers[tld] = server
+    return server
 
 
 # WHOIS lookup function with timeout and retry mechanism
-def whois_lookup(domain, retries=3, timeout=10):
-    # Set the signal handler for the timeout
-    signal.signal(signal.SIGALRM, timeout_handler)
+def whois_lookup(domain, retries=3, timeout=WHOIS_TIMEOUT):
+    """
+    Look up a domain's registrant country and organization.
 
+    Queries go straight to the registry (and the registrar it refers to)
+    over sockets with real timeouts, so this is safe to call from worker
+    threads and executors, unlike the SIGALRM-based whois.whois().
+
+    Returns:
+        tuple: (country, organization), "Unknown" when not found.
+    """
     for attempt in range(retries):
         try:
-            # Start the alarm for the timeout duration
-            signal.alarm(timeout)
             logger.debug(f"Attempting WHOIS lookup for {domain}, attempt {attempt + 1}")
+            server = _whois_server_for(domain, timeout)
+            if not server:
+                logger.debug(f"No WHOIS server known for {domain}")
+                return "Unknown", "Unknown"
 
-            # Perform the whois lookup
-            response = whois.whois(domain)
+            text = _whois_query(server, domain, timeout)
+            # Thin registries (e.g. .com) only point to the registrar's server
+            match = WHOIS_REGISTRAR_PATTERN.search(text)
+            registrar = match.group(1).strip().lower() if match else None
+            if registrar and registrar != server:
+                # The registry's own answer is still usable if the registrar fails
+                try:
+                    text = _whois_query(registrar, domain, timeout) or text
+                except OSError as e:
+                    logger.debug(f"Registrar WHOIS {registrar} failed for {domain}: {e}")
 
-            # Cancel the alarm if successful
-            signal.alarm(0)
+            response = WhoisEntry.load(domain, text)
 
             # Check if the response is valid and not empty
             if response is None:
@@ -65,7 +307,7 @@ def whois_lookup(domain, retries=3, timeout=10):
             org = response.get("org", "Unknown") if response else "Unknown"
 
             return country, org
-        except TimeoutError:
+        except socket.timeout:
             logger.warning(
                 f"WHOIS lookup timed out for {domain}, attempt {attempt + 1}"
             )
@@ -75,45 +317,272 @@ def whois_lookup(domain, retries=3, timeout=10):
                 f"WHOIS lookup failed for {domain} at attempt {attempt + 1}: {e}"
             )
 
-        # Wait before retrying
-        time.sleep(2)
-
-    # Remove the alarm in case of failure after retries
-    signal.alarm(0)
+        # Wait before retrying; only this worker waits, not the whole scan
+        time.sleep(WHOIS_RETRY_DELAY)
 
     # Return Unknown if all retries fail
     return "Unknown", "Unknown"
 
 
+def lookup_mx_records(domain):
+    """
+    Cached, coalesced variant of dns_mx_lookup.
+    """
+    return cached_domain_lookup("mx", domain, dns_mx_lookup, _mx_failed)
+
+
+async def mx_lookup_many_async(domains, concurrency=None, timeout=None):
+    """
+    Resolve the MX records of many domains concurrently with dnspython's
+    asyncio resolver. Results are not cached; see mx_lookup_many.
+
+    Returns:
+        dict: Mapping of domain to its list of MX hosts ([] on failure).
+    """
+    resolver = _configure_resolver(
+        dns.asyncresolver.Resolver(configure=not _dns_settings["nameservers"]),
+        timeout,
+    )
+    semaphore = asyncio.Semaphore(concurrency or _dns_settings["concurrency"])
+
+    async def resolve(domain):
+        async with semaphore:
+            try:
+                answer = await resolver.resolve(domain, "MX")
+                return domain, [str(r.exchange) for r in answer]
+            except Exception as e:
+                logger.error(f"DNS MX lookup failed for {domain}: {e}")
+                return domain, []
+
+    return dict(await asyncio.gather(*(resolve(domain) for domain in domains)))
+
+
+async def host_lookup_many_async(hosts, concurrency=None, timeout=None):
+    """
+    Resolve many host names to their IPv4 addresses, or IPv6 addresses for
+    IPv6-only hosts, concurrently. Results are not cached; see
+    host_lookup_many.
+
+    Returns:
+        dict: Mapping of host to its list of addresses ([] on failure).
+    """
+    resolver = _configure_resolver(
+        dns.asyncresolver.Resolver(configure=not _dns_settings["nameservers"]),
+        timeout,
+    )
+    semaphore = asyncio.Semaphore(concurrency or _dns_settings["concurrency"])
+
+    async def resolve(host):
+        async with semaphore:
+            for record_type in ("A", "AAAA"):
+                try:
+                    answer = await resolver.resolve(host, record_type)
+                    return host, [r.to_text() for r in answer]
+                except dns.resolver.NoAnswer:
+                    continue
+                except Exception as e:
+                    logger.error(f"DNS {record_type} lookup failed for {host}: {e}")
+                    break
+            return host, []
+
+    return dict(await asyncio.gather(*(resolve(host) for host in hosts)))
+
+
+def _cached_lookup_many(kind, names, lookup_many_async, failed, concurrency, timeout):
+    """
+    Read `names` through the domain cache and resolve the uncached ones with
+    `lookup_many_async` in one event loop. Fresh answers, including
+    failures, are written back to the cache.
+    """
+    cache = _cache()
+    results = {}
+    missing = []
+    for name in dict.fromkeys(names):
+        value = cache.get(_domain_key(kind, name))
+        if value is None:
+            missing.append(name)
+        else:
+            results[name] = value
+
+    if missing:
+        logger.debug(f"Resolving {kind} records for {len(missing)} names")
+        resolved = asyncio.run(lookup_many_async(missing, concurrency, timeout))
+        for name, value in resolved.items():
+            _store_domain_record(kind, name, value, failed)
+        results.update(resolved)
+    return results
+
+
+def mx_lookup_many(domains, concurrency=None, timeout=None):
+    """
+    Resolve the MX records of a set of domains, reading through the domain
+    cache and resolving all uncached domains concurrently in one event loop.
+
+    Returns:
+        dict: Mapping of domain to its list of MX hosts.
+    """
+    return _cached_lookup_many(
+        "mx", domains, mx_lookup_many_async, _mx_failed, concurrency, timeout
+    )
+
+
+def host_lookup_many(hosts, concurrency=None, timeout=None):
+    """
+    Resolve a set of host names to addresses through the domain cache.
+
+    Returns:
+        dict: Mapping of host to its list of addresses.
+    """
+    return _cached_lookup_many(
+        "addr", hosts, host_lookup_many_async, _addr_failed, concurrency, timeout
+    )
+
+
+def is_hosted_mail_host(host):
+    """
+    Tell whether an MX host belongs to a mail hosting provider (see
+    HOSTED_MAIL_MX_SUFFIXES).
+    """
+    host = host.lower().rstrip(".")
+    return any(
+        host == suffix or host.endswith(f".{suffix}")
+        for suffix in HOSTED_MAIL_MX_SUFFIXES
+    )
+
+
+def mx_country(mx_records):
+    """
+    Geolocate a domain's mail servers offline: resolve the MX hosts and look
+    their addresses up in the IP range database. Hosts of mail hosting
+    providers say nothing about the domain and are skipped.
+
+    Returns:
+        str or None: The country most self-hosted MX hosts are located in.
+    """
+    mx_records = [host for host in mx_records or [] if not is_hosted_mail_host(host)]
+    if not mx_records:
+        return None
+    addresses = host_lookup_many(mx_records)
+    votes = Counter()
+    for host in mx_records:
+        for address in addresses.get(host, []):
+            country = country_for_code(ip_country_code(address))
+            if country:
+                votes[country] += 1
+                break
+    if not votes:
+        return None
+    country, _ = votes.most_common(1)[0]
+    return country
+
+
+def lookup_whois(domain):
+    """
+    Cached, coalesced variant of whois_lookup.
+
+    Returns:
+        tuple: (country, organization)
+    """
+    country, org = cached_domain_lookup(
+        "whois",
+        domain,
+        lambda d: list(whois_lookup(d)),
+        lambda result: all(v in (None, "Unknown") for v in result),
+    )
+    return country, org
+
+
+def email_domain(email):
+    return email.split("@")[-1] if "@" in email else email
+
+
+def prefetch_domain_locations(emails, max_workers=WHOIS_WORKERS):
+    """
+    Resolve the MX and WHOIS records of all unique, non-free domains among
+    `emails` that the offline classifier cannot attribute, so later
+    resolve_domain_location calls are cache hits. MX records are resolved on
+    one event loop, WHOIS on a worker pool.
+    """
+    domains = {
+        email_domain(email).lower()
+        for email in emails
+        if email and "@" in email
+    }
+    domains = {
+        domain
+        for domain in domains - set(FREE_EMAIL_DOMAINS)
+        if not classify_domain(domain)
+    }
+    if not domains:
+        return
+    mx_records = mx_lookup_many(domains)
+    host_lookup_many(
+        {
+            host
+            for hosts in mx_records.values()
+            for host in hosts
+            if not is_hosted_mail_host(host)
+        }
+    )
+    registered = {registrable_domain(domain) for domain in domains}
+    logger.debug(f"Resolving WHOIS for {len(registered)} domains")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(lookup_whois, registered))
+
+
 def resolve_domain_location(email):
-    domain = email.split("@")[-1] if "@" in email else email
+    domain = email_domain(email)
     if domain in FREE_EMAIL_DOMAINS:
         return {
             "domain": domain,
             "mx_records": [],
+            "mx_country": "Unknown",
             "country": "Unknown",  # Always default to "Unknown" if it's a free email domain
             "organization": "Unknown",
         }
 
+    # ccTLDs and known domains are attributed offline, without DNS/WHOIS
+    country = classify_domain(domain)
+    if country:
+        logger.debug(f"Classified {domain} as {country} without network lookups")
+        return {
+            "domain": domain,
+            "mx_records": [],
+            "mx_country": "Unknown",
+            "country": country,
+            "organization": "Unknown",
+        }
+
     # Default values for country and organization
     country = "Unknown"
     org = "Unknown"
 
+    # A DNS failure must not cost the WHOIS answer, so each has its own guard
     try:
         logger.debug(f"Resolving DNS MX records for {domain}")
-        mx_records = dns_mx_lookup(domain)
+        mx_records = lookup_mx_records(domain)
+        mx_geo = mx_country(mx_records)
+    except Exception as e:
+        logger.error(f"Error during DNS lookup for {domain}: {e}")
+        mx_records = []
+        mx_geo = None
 
+    try:
         logger.debug(f"Attempting WHOIS lookup for {domain}")
-        country, org = whois_lookup(domain)
+        country, org = lookup_whois(registrable_domain(domain))
     except Exception as e:
-        # Log error if WHOIS or DNS fails, but only in debug
-        logger.error(f"Error during DNS/WHOIS lookup for {domain}: {e}")
-        mx_records = []
+        logger.error(f"Error during WHOIS lookup for {domain}: {e}")
+
+    # Registrant data is often redacted; fall back to where the mail servers are
+    if country in (None, "Unknown") and mx_geo:
+        logger.debug(f"Located {domain} in {mx_geo} from its MX hosts")
+        country = mx_geo
 
     # Return the results, ensuring country is never None
     return {
         "domain": domain,
         "mx_records": mx_records,
+        "mx_country": mx_geo or "Unknown",
         "country": country
         or "Unknown",  # Ensuring "Unknown" as a default if the country is None
         "organization": org or "Unknown",  # Same for organization
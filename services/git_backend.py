@@ -0,0 +1,203 @@
+import os
+import re
+import subprocess
+import logging
+from datetime import datetime
+from utils.cache import CACHE_DIR
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Bare clones live here, one per owner/repository
+GIT_CACHE_DIR = os.path.join(CACHE_DIR, "repos")
+
+# ASCII record/unit separators cannot appear in names, emails or dates
+RECORD_SEPARATOR = "\x1e"
+FIELD_SEPARATOR = "\x1f"
+LOG_FORMAT = "%x1e%H%x1f%an%x1f%ae%x1f%aI%x1f%cI%x1f%B%x1f"
+
+NOREPLY_PATTERN = re.compile(r"^(?:\d+\+)?([^@]+)@users\.noreply\.github\.com$", re.I)
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class GitBackendError(Exception):
+    """Raised when a git command fails."""
+
+
+def _run_git(args, cwd=None):
+    result = subprocess.run(
+        ["git"] + args, cwd=cwd, capture_output=True, text=True, check=False
+    )
+    if result.returncode != 0:
+        raise GitBackendError(f"git {' '.join(args)} failed: {result.stderr.strip()}")
+    return result.stdout
+
+
+def clone_repository(repo_location, cache_dir=GIT_CACHE_DIR):
+    """
+    Return a local git directory for a repository, cloning or updating a
+    bare, single-branch copy in the cache when given a remote URL.
+
+    Blobs are fetched too: --numstat diffs every commit, so a blob-less
+    partial clone would lazily request each blob from the remote.
+
+    Args:
+        repo_location (str): Local repository path or remote URL.
+        cache_dir (str): Directory holding the cached bare clones.
+
+    Returns:
+        str: Path usable as `git -C <path>`.
+    """
+    if os.path.isdir(repo_location):
+        return repo_location
+
+    owner, repo_name = repo_location.rstrip("/").split("/")[-2:]
+    if repo_name.endswith(".git"):
+        repo_name = repo_name[:-4]
+    target = os.path.join(cache_dir, owner, f"{repo_name}.git")
+    url = repo_location if repo_location.endswith(".git") else f"{repo_location}.git"
+
+    if os.path.isdir(target):
+        branch = _run_git(["symbolic-ref", "--short", "HEAD"], cwd=target).strip()
+        logger.debug(f"Updating cached clone {target} ({branch})")
+        _run_git(
+            ["fetch", "--prune", "origin", f"+refs/heads/{branch}:refs/heads/{branch}"],
+            cwd=target,
+        )
+    else:
+        logger.debug(f"Cloning {url} into {target}")
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        _run_git(["clone", "--bare", "--single-branch", url, target])
+    return target
+
+
+def login_from_email(email):
+    """
+    Recover a GitHub login from a noreply commit email, if it is one.
+    """
+    match = NOREPLY_PATTERN.match(email or "")
+    return match.group(1) if match else None
+
+
+def parse_log_record(chunk):
+    """
+    Parse one `git log --numstat` record produced with LOG_FORMAT into the
+    commit record dict consumed by `process_commit_details`.
+    """
+    sha, name, email, date, committed, remainder = chunk.split(FIELD_SEPARATOR, 5)
+    message, _, numstat = remainder.partition(FIELD_SEPARATOR)
+    authored = datetime.fromisoformat(date)
+
+    files = []
+    additions = 0
+    deletions = 0
+    for line in numstat.splitlines():
+        parts = line.split("\t", 2)
+        if len(parts) != 3:
+            continue
+        # Binary files are reported as "-"
+        added = int(parts[0]) if parts[0] != "-" else 0
+        deleted = int(parts[1]) if parts[1] != "-" else 0
+        additions += added
+        deletions += deleted
+        files.append(
+            {
+                "filename": parts[2],
+                "additions": added,
+                "deletions": deleted,
+                "changes": added + deleted,
+            }
+        )
+
+    return {
+        "sha": sha,
+        "message": message.strip(),
+        "date": authored,
+        "committed_date": datetime.fromisoformat(committed),
+        "timezone": authored.strftime("%z"),
+        "additions": additions,
+        "deletions": deletions,
+        "files_changed": len(files),
+        "files": files,
+        "author_login": login_from_email(email),
+        "author_name": name,
+        "author_email": email,
+    }
+
+
+def iter_git_commits(repo_path, author=None, since=None, rev="HEAD"):
+    """
+    Stream commit records from a local repository, newest first, in a single
+    `git log --numstat` pass without holding the whole history in memory.
+
+    Args:
+        repo_path (str): Local repository or bare clone.
+        author (str or list): Optional text that the author name or email
+            must contain, case-insensitively (`git log --author`); any of
+            several texts when given a list.
+        since (datetime): Optional lower bound on the commit date.
+        rev (str): Revision to walk from.
+    """
+    args = ["git", "-C", repo_path, "log", "--numstat", "--no-renames"]
+    args.append(f"--format={LOG_FORMAT}")
+    if author:
+        authors = [author] if isinstance(author, str) else author
+        args.extend(["--fixed-strings", "--regexp-ignore-case"])
+        args.extend(f"--author={pattern}" for pattern in authors)
+    if since:
+        args.append(f"--since={since.isoformat()}")
+    args.append(rev)
+
+    process = subprocess.Popen(
+        args,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+    buffer = ""
+    try:
+        while True:
+            data = process.stdout.read(READ_CHUNK_SIZE)
+            if not data:
+                break
+            buffer += data
+            *complete, buffer = buffer.split(RECORD_SEPARATOR)
+            for chunk in complete:
+                if chunk.strip():
+                    yield parse_log_record(chunk)
+        if buffer.strip():
+            yield parse_log_record(buffer)
+    finally:
+        process.stdout.close()
+        stderr = process.stderr.read()
+        process.stderr.close()
+        if process.wait() != 0 and stderr:
+            logger.error(f"git log failed for {repo_path}: {stderr.strip()}")
+
+
+def contributor_key(record):
+    """
+    Identify the contributor of a commit: their GitHub login when the commit
+    email reveals it, otherwise the commit email.
+    """
+    return record["author_login"] or record["author_email"]
+
+
+def iter_contributor_commits(repo_path, contributor, emails=(), since=None):
+    """
+    Stream the commit records of one contributor: those whose
+    `contributor_key` is the contributor (a GitHub login or a commit email)
+    or whose email is one of the contributor's known `emails`.
+
+    `--author` alone would also match other people whose name or email
+    merely contains the login, so it only narrows the walk and every
+    record is checked against the contributor key.
+    """
+    wanted = {key.casefold() for key in [contributor, *emails] if key}
+    for record in iter_git_commits(repo_path, author=sorted(wanted), since=since):
+        keys = (contributor_key(record), record["author_email"])
+        if any(key and key.casefold() in wanted for key in keys):
+            yield record
@@ -1,7 +1,15 @@
 import os
+import json
+import time
+import threading
+from datetime import datetime
+import requests
 from github import Github
+from github.Requester import Requester
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 import logging
+from utils.cache import PersistentCache
 
 # Load the .env file and retrieve GitHub token
 load_dotenv()
@@ -10,44 +18,784 @@ load_dotenv()
 logger = logging.getLogger(__name__)
 
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+# Optional comma-separated pool of additional tokens
+GITHUB_TOKENS = os.getenv("GITHUB_TOKENS", "")
 
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
 
-def github_client():
-    if not GITHUB_TOKEN:
+# GraphQL allows up to 100 nodes per connection page; user lookups are batched
+# as aliased fields in a single query, so keep the batch at the same size.
+GRAPHQL_PAGE_SIZE = 100
+GRAPHQL_USER_BATCH_SIZE = 100
+GRAPHQL_TIMEOUT = 30
+
+USER_PROFILE_FIELDS = """
+    login
+    id
+    name
+    email
+    location
+    company
+"""
+
+COMMIT_HISTORY_QUERY = """
+query($owner: String!, $name: String!, $first: Int!, $cursor: String,
+      $author: CommitAuthor, $since: GitTimestamp) {
+  repository(owner: $owner, name: $name) {
+    defaultBranchRef {
+      target {
+        ... on Commit {
+          history(first: $first, after: $cursor, author: $author, since: $since) {
+            pageInfo {
+              hasNextPage
+              endCursor
+            }
+            nodes {
+              oid
+              message
+              additions
+              deletions
+              changedFilesIfAvailable
+              committedDate
+              author {
+                name
+                email
+                date
+                user {
+                  login
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+# Once a resource's remaining budget falls below this fraction of its limit,
+# requests are spread evenly over the time left until the window resets.
+RATE_LIMIT_LOW_WATER = 0.1
+RATE_LIMIT_MAX_RETRIES = 3
+
+# Defaults for the on-disk REST response cache
+HTTP_CACHE_TTL = 6 * 60 * 60
+HTTP_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+_graphql_session = requests.Session()
+
+# Shared by every connection PyGithub opens so keep-alive connections are reused
+_rest_session = None
+_rest_session_lock = threading.Lock()
+_transport_installed = False
+
+# Response cache state, set through configure_http_cache()
+_http_cache = None
+_http_cache_refresh = False
+_http_cache_settings = {
+    "enabled": True,
+    "ttl": HTTP_CACHE_TTL,
+    "max_bytes": HTTP_CACHE_MAX_BYTES,
+}
+
+
+class GraphQLError(Exception):
+    """Raised when the GitHub GraphQL API returns errors and no data."""
+
+
+class RateLimitScheduler:
+    """
+    Token bucket shared by every thread that talks to GitHub.
+
+    The bucket of each rate-limit resource (core, search, graphql, ...) is
+    refilled from the X-RateLimit-* headers of every response and drained
+    locally by every request about to be sent, so concurrent workers see each
+    other's usage before the server reports it. Secondary limits announced
+    with Retry-After pause all workers at once.
+    """
+
+    def __init__(self, low_water=RATE_LIMIT_LOW_WATER):
+        self.low_water = low_water
+        self._lock = threading.Lock()
+        self._budgets = {}
+        self._next_slot = {}
+        self._blocked_until = 0.0
+
+    def reserve(self, resource="core"):
+        """
+        Claim one request from the shared budget.
+
+        Returns:
+            float: Seconds the caller must wait before sending the request.
+        """
+        with self._lock:
+            now = time.time()
+            start = max(now, self._blocked_until)
+            budget = self._budgets.get(resource)
+
+            if budget is not None:
+                start = max(start, budget.get("not_before", 0.0))
+                if budget["reset"] <= start:
+                    # The window has rolled over; the next response reports the new one
+                    budget.update(
+                        remaining=budget["limit"], reset=start + 3600, estimated=True
+                    )
+                if budget["remaining"] <= 0:
+                    # Exhausted: nobody may send before the reset, then draw anew
+                    start = max(start, budget["reset"] + 1)
+                    budget.update(
+                        remaining=budget["limit"],
+                        reset=start + 3600,
+                        not_before=start,
+                        estimated=True,
+                    )
+                elif budget["remaining"] < budget["limit"] * self.low_water:
+                    # Spread what is left over the rest of the window, measured
+                    # from this request's own slot, which never passes the reset
+                    start = min(
+                        max(start, self._next_slot.get(resource, 0.0)), budget["reset"]
+                    )
+                    interval = (budget["reset"] - start) / budget["remaining"]
+                    self._next_slot[resource] = start + interval
+                budget["remaining"] -= 1
+
+            return max(0.0, start - now)
+
+    def acquire(self, resource="core"):
+        """
+        Block the calling thread until a request for `resource` may be sent.
+        """
+        delay = self.reserve(resource)
+        if delay > 0:
+            logger.warning(f"GitHub {resource} rate limit: waiting {delay:.1f}s")
+            time.sleep(delay)
+
+    def update(self, headers, status=200, resource=None):
+        """
+        Refresh the shared budget from the headers of a GitHub response.
+        """
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        resource = headers.get("x-ratelimit-resource", resource or "core")
+
+        with self._lock:
+            now = time.time()
+            retry_after = headers.get("retry-after")
+            if retry_after and status in (403, 429):
+                self._blocked_until = max(
+                    self._blocked_until, now + float(retry_after)
+                )
+                logger.warning(
+                    f"GitHub secondary rate limit hit; pausing for {retry_after}s"
+                )
+
+            if "x-ratelimit-remaining" not in headers:
+                return
+            remaining = int(headers["x-ratelimit-remaining"])
+            limit = int(headers.get("x-ratelimit-limit", remaining))
+            reset = float(headers.get("x-ratelimit-reset", now + 3600))
+
+            budget = self._budgets.get(resource)
+            if budget is None or budget.get("estimated") or reset > budget["reset"]:
+                self._budgets[resource] = {
+                    "limit": limit,
+                    "remaining": remaining,
+                    "reset": reset,
+                    "not_before": budget.get("not_before", 0.0) if budget else 0.0,
+                }
+            else:
+                # Responses arrive out of order; keep the lowest count this window
+                budget["remaining"] = min(budget["remaining"], remaining)
+
+    def headroom(self, resource="core", now=None):
+        """
+        Report how much of `resource` is left and when it may next be used.
+
+        Returns:
+            tuple: (remaining or None if unknown, earliest send time as epoch)
+        """
+        with self._lock:
+            now = now or time.time()
+            available_at = max(now, self._blocked_until)
+            budget = self._budgets.get(resource)
+            if budget is None:
+                return None, available_at
+            available_at = max(available_at, budget.get("not_before", 0.0))
+            if budget["remaining"] <= 0 and budget["reset"] > now:
+                available_at = max(available_at, budget["reset"] + 1)
+            return budget["remaining"], available_at
+
+    def snapshot(self):
+        """
+        Return a copy of the known budget of every resource.
+        """
+        with self._lock:
+            return {
+                resource: dict(budget) for resource, budget in self._budgets.items()
+            }
+
+
+def is_rate_limited(status, headers):
+    """
+    Tell whether a response was rejected because of a primary or secondary
+    rate limit rather than a permission problem.
+    """
+    if status not in (403, 429):
+        return False
+    headers = {k.lower(): v for k, v in (headers or {}).items()}
+    return "retry-after" in headers or headers.get("x-ratelimit-remaining") == "0"
+
+
+def rate_limit_resource(path):
+    """
+    Map a request path onto the GitHub rate-limit resource it draws from.
+    """
+    if path.startswith("/search"):
+        return "search"
+    if path.startswith("/graphql"):
+        return "graphql"
+    return "core"
+
+
+class TokenPool:
+    """
+    Routes requests across several GitHub tokens.
+
+    Each token has its own RateLimitScheduler. A request goes to the usable
+    token with the most remaining budget for its resource; tokens that are
+    exhausted or blocked by a secondary limit are parked until they reset.
+    """
+
+    def __init__(self, tokens=None):
+        self._lock = threading.Lock()
+        self._schedulers = {}
+        self.set_tokens(tokens or [])
+
+    def set_tokens(self, tokens):
+        with self._lock:
+            tokens = [token for token in dict.fromkeys(tokens) if token]
+            self._schedulers = {
+                token: self._schedulers.get(token) or RateLimitScheduler()
+                for token in tokens
+            }
+
+    @property
+    def tokens(self):
+        return list(self._schedulers)
+
+    def reserve(self, resource="core"):
+        """
+        Pick a token for one request without blocking.
+
+        Returns:
+            tuple: (token, seconds to wait before sending with it)
+        """
+        with self._lock:
+            if not self._schedulers:
+                raise ValueError("GitHub token not found in .env file.")
+            now = time.time()
+            best_key = None
+            best_token = None
+            for token, scheduler in self._schedulers.items():
+                remaining, available_at = scheduler.headroom(resource, now)
+                # Usable tokens first, then the most budget; unknown budgets are
+                # tried early so their headers get learned
+                key = (
+                    available_at,
+                    -(remaining if remaining is not None else float("inf")),
+                )
+                if best_key is None or key < best_key:
+                    best_key = key
+                    best_token = token
+            return best_token, self._schedulers[best_token].reserve(resource)
+
+    def checkout(self, resource="core"):
+        """
+        Pick a token for one request, waiting if every token is parked.
+
+        Returns:
+            str: The token to authenticate the request with.
+        """
+        token, delay = self.reserve(resource)
+        if delay > 0:
+            logger.warning(
+                f"GitHub {resource} budget is low on every token: waiting {delay:.1f}s"
+            )
+            time.sleep(delay)
+        return token
+
+    def update(self, token, headers, status=200, resource=None):
+        """
+        Refresh a token's budget from the headers of a response it authenticated.
+        """
+        scheduler = self._schedulers.get(token)
+        if scheduler is not None:
+            scheduler.update(headers, status, resource)
+
+    def wait(self, resource="core"):
+        """
+        Block until at least one token may send a `resource` request again.
+        """
+        with self._lock:
+            times = [
+                scheduler.headroom(resource)[1]
+                for scheduler in self._schedulers.values()
+            ]
+        delay = min(times) - time.time() if times else 0
+        if delay > 0:
+            logger.warning(f"GitHub {resource} rate limit: waiting {delay:.1f}s")
+            time.sleep(delay)
+
+    def snapshot(self):
+        """
+        Return the known budgets of every token, keyed by a masked token.
+        """
+        with self._lock:
+            return {
+                mask_token(token): scheduler.snapshot()
+                for token, scheduler in self._schedulers.items()
+            }
+
+
+def mask_token(token):
+    """
+    Shorten a token so it can be shown in logs without leaking it.
+    """
+    return f"{token[:4]}...{token[-4:]}" if token and len(token) > 8 else "****"
+
+
+def load_github_tokens():
+    """
+    Read GITHUB_TOKEN and the comma-separated GITHUB_TOKENS pool from the
+    environment, dropping blanks and duplicates.
+    """
+    tokens = [GITHUB_TOKEN] + [t.strip() for t in GITHUB_TOKENS.split(",")]
+    return [token for token in dict.fromkeys(tokens) if token]
+
+
+def token_from_header(authorization):
+    """
+    Extract the token from an Authorization header value.
+    """
+    if not authorization:
+        return None
+    return authorization.split(" ", 1)[-1]
+
+
+# Shared by every thread and client in the process
+token_pool = TokenPool(load_github_tokens())
+
+
+class CachedResponse:
+    """
+    Mimics the httplib-style response object PyGithub's Requester reads.
+    """
+
+    def __init__(self, status, headers, text):
+        self.status = status
+        self.headers = headers
+        self.text = text
+
+    def getheaders(self):
+        return self.headers.items()
+
+    def read(self):
+        return self.text
+
+
+class CachingHTTPSConnection:
+    """
+    Drop-in replacement for PyGithub's HTTPS connection class.
+
+    GET responses are stored on disk together with their ETag/Last-Modified
+    validators. While a stored response is within its TTL it is served without
+    touching the network; once stale it is revalidated with a conditional
+    request, and GitHub's 304 replies do not count against the rate limit.
+    """
+
+    def __init__(
+        self,
+        host,
+        port=None,
+        strict=False,
+        timeout=None,
+        retry=None,
+        pool_size=None,
+        **kwargs,
+    ):
+        self.host = host
+        self.port = port if port else 443
+        self.protocol = "https"
+        self.timeout = timeout
+        self.verify = kwargs.get("verify", True)
+        self.session = _get_rest_session(retry, pool_size)
+
+    def request(self, verb, url, input, headers):
+        self.verb = verb
+        self.url = url
+        self.input = input
+        self.headers = dict(headers or {})
+
+    def getresponse(self):
+        url = f"{self.protocol}://{self.host}:{self.port}{self.url}"
+        cacheable = (
+            _http_cache is not None
+            and self.verb.upper() == "GET"
+            and not self.input
+            and not self.url.startswith("/rate_limit")
+        )
+        if not cacheable:
+            return self._send(url, self.headers)
+
+        key = f"{url}|{self.headers.get('Accept', '')}"
+        entry = _http_cache.get_entry(key)
+        if entry is not None:
+            cached = entry["value"]
+            if not entry["expired"] and not _http_cache_refresh:
+                logger.debug(f"HTTP cache hit for {self.url}")
+                return CachedResponse(200, cached["headers"], cached["body"])
+
+            # Stale or refresh requested: revalidate with the stored validators
+            headers = dict(self.headers)
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+            response = self._send(url, headers)
+            if response.status == 304:
+                logger.debug(f"HTTP cache revalidated {self.url}")
+                _http_cache.touch(key)
+                merged = dict(cached["headers"])
+                merged.update(response.headers)
+                return CachedResponse(200, merged, cached["body"])
+        else:
+            response = self._send(url, self.headers)
+
+        if response.status == 200:
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                _http_cache.set(
+                    key,
+                    {
+                        "headers": dict(response.headers),
+                        "body": response.text,
+                        "etag": etag,
+                        "last_modified": last_modified,
+                    },
+                )
+        return response
+
+    def _send(self, url, headers):
+        method = getattr(self.session, self.verb.lower())
+        resource = rate_limit_resource(self.url)
+        headers = dict(headers)
+        for attempt in range(RATE_LIMIT_MAX_RETRIES + 1):
+            if self.url.startswith("/rate_limit"):
+                # Rate limit checks are free and must report on the caller's own token
+                token = token_from_header(headers.get("Authorization"))
+            else:
+                token = token_pool.checkout(resource)
+                headers["Authorization"] = f"token {token}"
+            r = method(
+                url,
+                headers=headers,
+                data=self.input,
+                timeout=self.timeout,
+                verify=self.verify,
+                allow_redirects=False,
+            )
+            token_pool.update(token, r.headers, r.status_code, resource)
+            if not is_rate_limited(r.status_code, r.headers):
+                break
+            # The scheduler now knows when the limit lifts; the next acquire waits for it
+            logger.warning(f"Rate limited on {self.url}, attempt {attempt + 1}")
+        return CachedResponse(r.status_code, r.headers, r.text)
+
+    def close(self):
+        # The session is shared between connections and outlives this object
+        pass
+
+
+def _get_rest_session(retry=None, pool_size=None):
+    global _rest_session
+    with _rest_session_lock:
+        if _rest_session is None:
+            session = requests.Session()
+            if retry is None:
+                retry = requests.adapters.DEFAULT_RETRIES
+            adapter = requests.adapters.HTTPAdapter(
+                max_retries=retry,
+                pool_connections=pool_size or 32,
+                pool_maxsize=pool_size or 32,
+            )
+            session.mount("https://", adapter)
+            _rest_session = session
+        return _rest_session
+
+
+def configure_http_cache(enabled=True, refresh=False, ttl=None, max_bytes=None):
+    """
+    Configure the on-disk REST response cache used by github_client().
+
+    Args:
+        enabled (bool): Set to False to bypass the cache entirely.
+        refresh (bool): Revalidate every cached response, ignoring the TTL.
+        ttl (float): Seconds a cached response is served without revalidation.
+        max_bytes (int): Size cap of the cache; least recently used entries
+            are evicted beyond it.
+    """
+    global _http_cache, _http_cache_refresh
+    _http_cache_settings["enabled"] = enabled
+    if ttl is not None:
+        _http_cache_settings["ttl"] = ttl
+    if max_bytes is not None:
+        _http_cache_settings["max_bytes"] = max_bytes
+    _http_cache_refresh = refresh
+    _http_cache = None
+
+
+def get_http_cache():
+    """
+    Return the shared REST response cache, or None when caching is disabled.
+    """
+    global _http_cache
+    if _http_cache is None and _http_cache_settings["enabled"]:
+        _http_cache = PersistentCache(
+            "http_cache",
+            ttl=_http_cache_settings["ttl"],
+            max_bytes=_http_cache_settings["max_bytes"],
+        )
+    return _http_cache
+
+
+def http_cache_refresh_requested():
+    return _http_cache_refresh
+
+
+def _install_transport():
+    global _transport_installed
+    get_http_cache()
+    if not _transport_installed:
+        # PyGithub exposes this hook to swap the classes it opens connections with
+        Requester.injectConnectionClasses(
+            CachingHTTPSConnection, CachingHTTPSConnection
+        )
+        _transport_installed = True
+
+
+def github_client(tokens=None):
+    """
+    Create a GitHub client whose requests are spread over a pool of tokens.
+
+    Args:
+        tokens (list): Optional tokens to use instead of GITHUB_TOKEN/GITHUB_TOKENS.
+    """
+    if tokens:
+        token_pool.set_tokens(tokens)
+    if not token_pool.tokens:
         logger.error("GitHub token not found in .env file.")
         raise ValueError("GitHub token not found in .env file.")
-    return Github(GITHUB_TOKEN)
+    _install_transport()
+    # Rate limits are handled by token_pool, so only retry transient server
+    # and connection errors here instead of PyGithub's sleeping retry.
+    retry = Retry(total=3, backoff_factor=1, status_forcelist=[500, 502, 503, 504])
+    # The transport picks the token per request, so the one given here only
+    # seeds PyGithub; use the maximum page size to need fewer round trips.
+    return Github(token_pool.tokens[0], per_page=100, retry=retry)
 
 
-def check_github_rate_limit():
+def graphql_query(query, variables=None):
+    """
+    Execute a query against the GitHub GraphQL API.
+
+    Args:
+        query (str): GraphQL query document.
+        variables (dict): Optional query variables.
+
+    Returns:
+        dict: The `data` member of the response.
+    """
+    for attempt in range(RATE_LIMIT_MAX_RETRIES + 1):
+        token = token_pool.checkout("graphql")
+        response = _graphql_session.post(
+            GITHUB_GRAPHQL_URL,
+            json={"query": query, "variables": variables or {}},
+            headers={"Authorization": f"bearer {token}"},
+            timeout=GRAPHQL_TIMEOUT,
+        )
+        token_pool.update(token, response.headers, response.status_code, "graphql")
+        if not is_rate_limited(response.status_code, response.headers):
+            break
+        logger.warning(f"GraphQL request rate limited, attempt {attempt + 1}")
+    response.raise_for_status()
+    payload = response.json()
+
+    errors = payload.get("errors")
+    data = payload.get("data")
+    if errors:
+        # Partial errors (e.g. a login that resolves to a bot) still return data
+        logger.debug(f"GraphQL query returned errors: {errors}")
+        if not data:
+            raise GraphQLError(errors[0].get("message", "Unknown GraphQL error"))
+    return data or {}
+
+
+def parse_github_timestamp(value):
+    """
+    Parse an ISO 8601 timestamp returned by GitHub, keeping its UTC offset.
+    """
+    if not value:
+        return None
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+
+def profile_from_user_node(login, node):
+    """
+    Convert a GraphQL user node into the contributor dict consumed by
+    `identify_geography_dict`.
+    """
+    node = node or {}
+    return {
+        "login": node.get("login") or login,
+        "node_id": node.get("id"),
+        "name": node.get("name"),
+        "email": node.get("email") or None,
+        "location": node.get("location"),
+        "company": node.get("company"),
+    }
+
+
+def commit_record_from_node(node):
+    """
+    Convert a GraphQL commit node into the commit record dict consumed by
+    `process_commit_details`.
+    """
+    author = node.get("author") or {}
+    user = author.get("user") or {}
+    return {
+        "sha": node["oid"],
+        "message": node.get("message", ""),
+        "date": parse_github_timestamp(author.get("date")),
+        "committed_date": parse_github_timestamp(node.get("committedDate")),
+        "additions": node.get("additions") or 0,
+        "deletions": node.get("deletions") or 0,
+        "files_changed": node.get("changedFilesIfAvailable"),
+        "author_login": user.get("login"),
+        "author_name": author.get("name"),
+        "author_email": author.get("email"),
+    }
+
+
+def fetch_contributor_logins(owner, repo_name):
+    """
+    List the logins of a repository's contributors.
+
+    The REST contributor listing already carries the login, so only the list
+    pages are requested here; profile fields are fetched separately in bulk.
+    """
     g = github_client()
-    rate_limit = g.get_rate_limit()
+    repo = g.get_repo(f"{owner}/{repo_name}")
+    return [contributor.login for contributor in repo.get_contributors()]
+
+
+def fetch_user_profiles(logins):
+    """
+    Fetch profile fields for many users with batched GraphQL queries.
+
+    Args:
+        logins (list): GitHub logins to resolve.
 
-    core_limit = rate_limit.core
-    search_limit = rate_limit.search
+    Returns:
+        dict: Mapping of login to contributor dict.
+    """
+    profiles = {}
+    logins = list(dict.fromkeys(logins))
+
+    for start in range(0, len(logins), GRAPHQL_USER_BATCH_SIZE):
+        batch = logins[start : start + GRAPHQL_USER_BATCH_SIZE]
+        fields = "\n".join(
+            f"u{i}: user(login: {json.dumps(login)}) {{ {USER_PROFILE_FIELDS} }}"
+            for i, login in enumerate(batch)
+        )
+        logger.debug(f"Fetching {len(batch)} user profiles via GraphQL")
+        data = graphql_query(f"query {{\n{fields}\n}}")
+        for i, login in enumerate(batch):
+            profiles[login] = profile_from_user_node(login, data.get(f"u{i}"))
+
+    return profiles
+
+
+def fetch_commit_history(owner, repo_name, author_id=None, since=None):
+    """
+    Yield commit records from the default branch, newest first, including
+    additions and deletions, one GraphQL page at a time.
+
+    Args:
+        owner (str): Repository owner.
+        repo_name (str): Repository name.
+        author_id (str): Optional GraphQL node ID of the author to filter by.
+        since (datetime): Optional lower bound on the commit date.
+    """
+    variables = {
+        "owner": owner,
+        "name": repo_name,
+        "first": GRAPHQL_PAGE_SIZE,
+        "cursor": None,
+        "author": {"id": author_id} if author_id else None,
+        "since": since.isoformat() if since else None,
+    }
+
+    while True:
+        data = graphql_query(COMMIT_HISTORY_QUERY, variables)
+        branch = (data.get("repository") or {}).get("defaultBranchRef")
+        if not branch:
+            return
+        history = branch["target"]["history"]
+
+        for node in history["nodes"]:
+            yield commit_record_from_node(node)
+
+        page_info = history["pageInfo"]
+        if not page_info["hasNextPage"]:
+            return
+        variables["cursor"] = page_info["endCursor"]
+
+
+def check_github_rate_limit():
+    """
+    Log the rate limits of every pooled token and their aggregate budget.
+    """
+    github_client()
+    totals = {}
 
-    # Display core and search rate limits
     logger.info("GitHub API Rate Limits:")
-    logger.info("  Core Rate Limit:")
-    logger.info(f"    Limit: {core_limit.limit}")
-    logger.info(f"    Remaining: {core_limit.remaining}")
-    logger.info(f"    Resets at: {core_limit.reset}")
-    logger.info("  Search Rate Limit:")
-    logger.info(f"    Limit: {search_limit.limit}")
-    logger.info(f"    Remaining: {search_limit.remaining}")
-    logger.info(f"    Resets at: {search_limit.reset}")
-
-    # Additional checks for GraphQL and other rate limits
-    if hasattr(rate_limit, "graphql"):
-        graphql_limit = rate_limit.graphql
-        logger.info("  GraphQL Rate Limit:")
-        logger.info(f"    Limit: {graphql_limit.limit}")
-        logger.info(f"    Remaining: {graphql_limit.remaining}")
-        logger.info(f"    Resets at: {graphql_limit.reset}")
-
-    if hasattr(rate_limit, "code_scanning_upload"):
-        scanning_limit = rate_limit.code_scanning_upload
-        logger.info("  Code Scanning Upload Rate Limit:")
-        logger.info(f"    Limit: {scanning_limit.limit}")
-        logger.info(f"    Remaining: {scanning_limit.remaining}")
-        logger.info(f"    Resets at: {scanning_limit.reset}")
+    for token in token_pool.tokens:
+        # /rate_limit keeps the token it is called with and does not count
+        rate_limit = Github(token).get_rate_limit()
+        logger.info(f"  Token {mask_token(token)}:")
+        for resource in ("core", "search", "graphql", "code_scanning_upload"):
+            rate = getattr(rate_limit, resource, None)
+            if rate is None:
+                continue
+            logger.info(
+                f"    {resource}: {rate.remaining}/{rate.limit}, resets at {rate.reset}"
+            )
+            total = totals.setdefault(
+                resource, {"limit": 0, "remaining": 0, "reset": None}
+            )
+            total["limit"] += rate.limit
+            total["remaining"] += rate.remaining
+            if total["reset"] is None or rate.reset < total["reset"]:
+                total["reset"] = rate.reset
+
+    logger.info(f"  Aggregate over {len(token_pool.tokens)} token(s):")
+    for resource, total in totals.items():
+        logger.info(f"    {resource.replace('_', ' ').title()} Rate Limit:")
+        logger.info(f"      Limit: {total['limit']}")
+        logger.info(f"      Remaining: {total['remaining']}")
+        logger.info(f"      Earliest reset: {total['reset']}")
+
+    return totals
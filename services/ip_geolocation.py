@@ -0,0 +1,159 @@
+import os
+import csv
+import bisect
+import socket
+import logging
+import ipaddress
+import threading
+from array import array
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# IP range database; iptoasn.com's ip2asn TSV files and DB-IP's country CSV
+# files both work. Override with ORIGIN_IP_RANGES.
+IP_RANGES_PATH = os.getenv("ORIGIN_IP_RANGES", "data/ip2asn-combined.tsv")
+
+# Country codes ip2asn uses for unannounced or unattributed ranges
+UNKNOWN_CODES = {"", "None", "ZZ", "--"}
+
+
+def _parse_ip(text):
+    """
+    Return (IP version, integer value) of an address given as text or, as
+    in ip2asn's u32 files, as a decimal IPv4 integer.
+    """
+    try:
+        # Much faster than ipaddress for the common dotted IPv4 case
+        return 4, int.from_bytes(socket.inet_pton(socket.AF_INET, text), "big")
+    except OSError:
+        pass
+    text = text.strip()
+    if text.isdigit():
+        return 4, int(text)
+    address = ipaddress.ip_address(text)
+    return address.version, int(address)
+
+
+def read_ip_ranges(file_path):
+    """
+    Yield (version, first, last, country code) for every attributed range.
+
+    Tab-separated rows are read as ip2asn (start, end, ASN, country, name),
+    comma-separated rows as DB-IP country lite (start, end, country).
+    """
+    with open(file_path, newline="", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            if "\t" in line:
+                row = line.rstrip("\n").split("\t")
+                start, end, code = row[0], row[1], row[3] if len(row) > 3 else ""
+            else:
+                row = next(csv.reader([line]))
+                start, end, code = row[0], row[1], row[-1]
+            if code.strip() in UNKNOWN_CODES:
+                continue
+            try:
+                version, first = _parse_ip(start)
+                _, last = _parse_ip(end)
+            except ValueError:
+                continue  # Header row or malformed address
+            yield version, first, last, code.strip().upper()
+
+
+class IPRangeIndex:
+    """
+    Sorted, non-overlapping IP ranges mapped to country codes.
+
+    IPv4 bounds are kept in compact unsigned 32-bit arrays and IPv6 bounds
+    in lists; a lookup is one bisect over the range starts and needs no I/O.
+    """
+
+    def __init__(self):
+        self._codes = []
+        self._code_ids = {}
+        self._tables = {
+            4: (array("I"), array("I"), array("H")),
+            6: ([], [], array("H")),
+        }
+
+    def __len__(self):
+        return sum(len(starts) for starts, _, _ in self._tables.values())
+
+    @classmethod
+    def from_ranges(cls, ranges):
+        """
+        Build an index from (version, first, last, country code) tuples in
+        any order.
+        """
+        index = cls()
+        for version, first, last, code in sorted(ranges):
+            starts, ends, codes = index._tables[version]
+            if ends and first <= ends[-1]:
+                continue  # Overlaps the previous range; the first one wins
+            code_id = index._code_ids.get(code)
+            if code_id is None:
+                code_id = index._code_ids[code] = len(index._codes)
+                index._codes.append(code)
+            starts.append(first)
+            ends.append(last)
+            codes.append(code_id)
+        return index
+
+    @classmethod
+    def from_file(cls, file_path=IP_RANGES_PATH):
+        return cls.from_ranges(read_ip_ranges(file_path))
+
+    def lookup(self, ip):
+        """
+        Return the country code of the range containing `ip`, or None.
+        """
+        try:
+            version, value = _parse_ip(ip)
+        except (TypeError, ValueError):
+            return None
+        return self.lookup_int(value, version)
+
+    def lookup_int(self, value, version=4):
+        """
+        Return the country code of the range containing the address with
+        integer value `value`, or None.
+        """
+        starts, ends, codes = self._tables[version]
+        i = bisect.bisect_right(starts, value) - 1
+        if i >= 0 and value <= ends[i]:
+            return self._codes[codes[i]]
+        return None
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_ip_index():
+    """
+    Return the process-wide IPRangeIndex, loading IP_RANGES_PATH on first
+    use. Without the database file the index is empty and every lookup
+    returns None.
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            try:
+                _index = IPRangeIndex.from_file(IP_RANGES_PATH)
+                logger.debug(f"Loaded {len(_index)} IP ranges from {IP_RANGES_PATH}")
+            except FileNotFoundError:
+                logger.warning(
+                    f"IP range database {IP_RANGES_PATH} not found; "
+                    "MX hosts will not be geolocated"
+                )
+                _index = IPRangeIndex()
+        return _index
+
+
+def ip_country_code(ip):
+    """
+    Return the country code of `ip` from the offline IP range database.
+    """
+    return get_ip_index().lookup(ip)
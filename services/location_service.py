@@ -1,29 +1,216 @@
 import os
-import requests
+import re
+import time
 import logging
-from utils.utils import load_world_cities
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from utils.cache import PersistentCache
 
 # Initialize logger
 logger = logging.getLogger(__name__)
 
-# Load city-country data
-city_country_dict = load_world_cities("data/world_cities.csv")
+LOCATIONIQ_BASE_URL = "https://us1.locationiq.com/v1"
+# LocationIQ's free tier allows 2 requests per second (5,000 per day)
+LOCATIONIQ_REQUESTS_PER_SECOND = 2
+LOCATIONIQ_TIMEOUT = 10
+LOCATIONIQ_MAX_RETRIES = 3
+LOCATIONIQ_POOL_SIZE = 4
 
+# Places do not move; failed lookups are retried much sooner
+GEOCODE_CACHE_TTL = 30 * 24 * 60 * 60
+GEOCODE_FAILURE_TTL = 60 * 60
 
-def get_location_geolocation(city_name, city_country_dict):
-    api_key = os.getenv("LOCATIONIQ_API_KEY")
-    if not api_key:
-        logger.error("LocationIQ API key not found in environment variables.")
-        raise ValueError("LocationIQ API key not found in environment variables.")
+UNKNOWN_LOCATION = ("Unknown", "Unknown")
+# Cached in place of a result while a failed lookup waits to be retried
+GEOCODE_FAILED = []
 
-    url = f"https://us1.locationiq.com/v1/search.php?key={api_key}&q={city_name}&format=json"
+API_KEY_PATTERN = re.compile(r"(key=)[^&\s\"']+")
+URL_QUERY_PATTERN = re.compile(r"(https?://[^\s?\"']*|/[\w./-]*)\?[^\s\"']*")
 
-    try:
-        logger.debug(f"Making request to LocationIQ API for city: {city_name}")
-        response = requests.get(url)
-        response.raise_for_status()  # Raise an error for bad HTTP status codes
-        data = response.json()
 
+def redact_api_key(text):
+    """
+    Mask the value of any `key=` query parameter in `text`.
+    """
+    return API_KEY_PATTERN.sub(r"\1***", str(text))
+
+
+def describe_request_error(error):
+    """
+    Describe a failed request without the query strings of the URLs it
+    mentions, which carry the API key and the searched location.
+    """
+    return URL_QUERY_PATTERN.sub(r"\1?...", redact_api_key(error))
+
+
+class _RedactApiKeyFilter(logging.Filter):
+    """
+    Strip the LocationIQ key from everything urllib3 logs: request lines,
+    retry warnings and the tracebacks attached to them.
+    """
+
+    def filter(self, record):
+        args = record.args or ()
+        if "key=" in str(record.msg) or any("key=" in str(arg) for arg in args):
+            record.msg = redact_api_key(record.getMessage())
+            record.args = ()
+        if record.exc_info and not record.exc_text:
+            # Formatters reuse exc_text instead of formatting the traceback anew
+            record.exc_text = redact_api_key(
+                logging.Formatter().formatException(record.exc_info)
+            )
+        return True
+
+
+class _RedactApiKeyHandler(logging.Handler):
+    """
+    Handler that emits nothing. Its filter runs on every record of the
+    urllib3 loggers and masks the key in place, before the record reaches
+    the handlers further up that write it out.
+    """
+
+    def emit(self, record):
+        pass
+
+
+# A filter on a logger misses its children's records, but the handlers of
+# "urllib3" see those of urllib3.connectionpool, urllib3.util.retry, ...
+_redacting_handler = _RedactApiKeyHandler()
+_redacting_handler.addFilter(_RedactApiKeyFilter())
+logging.getLogger("urllib3").addHandler(_redacting_handler)
+
+
+def location_query_key(query):
+    """
+    Cache key of a geocoding query: casefolded, with whitespace collapsed.
+    """
+    return " ".join(query.casefold().split())
+
+
+class LocationIQClient:
+    """
+    Geocoding client for the LocationIQ search API.
+
+    Requests share one pooled requests.Session with retries on 429/5xx, are
+    paced to the per-second limit of the account, and every answer is kept
+    in the persistent "geocoding" cache, so a place name costs one request
+    per GEOCODE_CACHE_TTL no matter how many contributors mention it.
+    """
+
+    def __init__(
+        self,
+        api_key=None,
+        base_url=None,
+        requests_per_second=LOCATIONIQ_REQUESTS_PER_SECOND,
+        timeout=LOCATIONIQ_TIMEOUT,
+        max_retries=LOCATIONIQ_MAX_RETRIES,
+        cache=None,
+    ):
+        """
+        Args:
+            api_key (str): LocationIQ key; defaults to LOCATIONIQ_API_KEY.
+            base_url (str): API root; defaults to LOCATIONIQ_BASE_URL or the
+                environment variable of the same name.
+            requests_per_second (float): Request budget of the account.
+            timeout (float): Seconds allowed for one request.
+            max_retries (int): Retries for rate-limited and failed requests.
+            cache (PersistentCache): Optional cache to use instead of "geocoding".
+        """
+        self.api_key = api_key or os.getenv("LOCATIONIQ_API_KEY")
+        self.base_url = (
+            base_url or os.getenv("LOCATIONIQ_BASE_URL") or LOCATIONIQ_BASE_URL
+        ).rstrip("/")
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.cache = cache
+        self._session = None
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def _cache(self):
+        if self.cache is None:
+            self.cache = PersistentCache("geocoding", ttl=GEOCODE_CACHE_TTL)
+        return self.cache
+
+    @property
+    def session(self):
+        if self._session is None:
+            retry = Retry(
+                total=self.max_retries,
+                backoff_factor=1,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=("GET",),
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(
+                max_retries=retry,
+                pool_connections=LOCATIONIQ_POOL_SIZE,
+                pool_maxsize=LOCATIONIQ_POOL_SIZE,
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._session = session
+        return self._session
+
+    def _wait_for_slot(self):
+        """
+        Block until the next request fits the per-second budget.
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def _search(self, query):
+        """
+        Run one uncached search request.
+
+        Returns:
+            tuple or None: (country code, display name), UNKNOWN_LOCATION when
+            LocationIQ has no match, or None when the request failed.
+        """
+        if not self.api_key:
+            logger.error("LocationIQ API key not found in environment variables.")
+            return None
+
+        self._wait_for_slot()
+        logger.debug(f"Making request to LocationIQ API for location: {query}")
+        try:
+            response = self.session.get(
+                f"{self.base_url}/search",
+                params={
+                    "key": self.api_key,
+                    "q": query,
+                    "format": "json",
+                    "addressdetails": 1,
+                    "limit": 1,
+                },
+                timeout=self.timeout,
+            )
+        except requests.RequestException as e:
+            logger.error(
+                f"Error resolving location {query} via LocationIQ API: {describe_request_error(e)}"
+            )
+            return None
+
+        # LocationIQ answers 404 "Unable to geocode" when nothing matches
+        if response.status_code == 404:
+            logger.warning(f"No results found for location {query}.")
+            return UNKNOWN_LOCATION
+        if response.status_code != 200:
+            logger.error(
+                f"LocationIQ API returned HTTP {response.status_code} for location {query}"
+            )
+            return None
+
+        data = response.json()
         if isinstance(data, list) and len(data) > 0:
             display_name = data[0].get("display_name", "")
             country_code = (
@@ -31,9 +218,112 @@ def get_location_geolocation(city_name, city_country_dict):
             )
             logger.debug(f"LocationIQ API response: {display_name}, {country_code}")
             return country_code, display_name
-        else:
-            logger.warning(f"No results found for city name {city_name}.")
-            return "Unknown", "Unknown"
-    except requests.RequestException as e:
-        logger.error(f"Error resolving city name {city_name} via LocationIQ API: {e}")
-        return "Unknown", "Unknown"
+        logger.warning(f"No results found for location {query}.")
+        return UNKNOWN_LOCATION
+
+    def geocode(self, query):
+        """
+        Geocode one free-form location.
+
+        Returns:
+            tuple: (country code, display name), or ("Unknown", "Unknown").
+        """
+        return self.geocode_many([query]).get(query, UNKNOWN_LOCATION)
+
+    def geocode_many(self, queries):
+        """
+        Geocode many locations, reading through the cache and requesting each
+        distinct place name (see location_query_key) at most once.
+
+        Returns:
+            dict: Query to a (country code, display name) tuple. Queries whose
+            request failed, now or within GEOCODE_FAILURE_TTL, are left out.
+        """
+        keys = {query: location_query_key(query) for query in queries if query}
+        pending = {key: query for query, key in keys.items() if key}
+        cache = self._cache()
+
+        results = {}
+        failed = set()
+        for key in pending:
+            cached = cache.get(key)
+            if cached == GEOCODE_FAILED:
+                failed.add(key)
+            elif cached is not None:
+                results[key] = tuple(cached)
+        missing = [key for key in pending if key not in results and key not in failed]
+        logger.debug(
+            f"Geocoding cache: {len(results)} cached, {len(failed)} recently "
+            f"failed, {len(missing)} to request"
+        )
+        if missing and not self.api_key:
+            logger.error("LocationIQ API key not found in environment variables.")
+            missing = []
+
+        for key in missing:
+            result = self._search(pending[key])
+            if result is None:
+                cache.set(key, GEOCODE_FAILED, ttl=GEOCODE_FAILURE_TTL)
+            else:
+                cache.set(key, result)
+                results[key] = result
+
+        return {
+            query: results[key] for query, key in keys.items() if key in results
+        }
+
+
+_geocoder = None
+_geocoding_enabled = False
+
+
+def configure_geocoding(enabled=False, base_url=None, requests_per_second=None):
+    """
+    Apply the command-line geocoding settings. When enabled, profile
+    locations the gazetteer cannot resolve are geocoded with LocationIQ;
+    without an API key, geocoding stays disabled.
+    """
+    global _geocoder, _geocoding_enabled
+    _geocoder = LocationIQClient(
+        base_url=base_url,
+        requests_per_second=requests_per_second or LOCATIONIQ_REQUESTS_PER_SECOND,
+    )
+    if enabled and not _geocoder.api_key:
+        logger.warning("LOCATIONIQ_API_KEY is not set; geocoding is disabled.")
+        enabled = False
+    _geocoding_enabled = enabled
+
+
+def geocoding_enabled():
+    return _geocoding_enabled
+
+
+def get_geocoder():
+    """
+    Return the process-wide LocationIQ client.
+    """
+    global _geocoder
+    if _geocoder is None:
+        _geocoder = LocationIQClient()
+    return _geocoder
+
+
+def geocode_locations(locations):
+    """
+    Geocode many location strings with the shared client.
+
+    Returns:
+        dict: Location to a (country code, display name) tuple; locations
+        whose lookup failed are left out.
+    """
+    return get_geocoder().geocode_many(locations)
+
+
+def get_location_geolocation(city_name, city_country_dict=None):
+    """
+    Geocode one city name with the shared client.
+
+    Returns:
+        tuple: (country code, display name), or ("Unknown", "Unknown").
+    """
+    return get_geocoder().geocode(city_name)
@@ -0,0 +1,89 @@
+import logging
+from utils.cache import PersistentCache
+from services.github_client import fetch_user_profiles
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Profiles rarely change; a week keeps repeated scans almost free
+PROFILE_CACHE_TTL = 7 * 24 * 60 * 60
+
+PROFILE_FIELDS = ("login", "node_id", "name", "email", "location", "company")
+
+_profile_cache = None
+
+
+def _cache():
+    global _profile_cache
+    if _profile_cache is None:
+        _profile_cache = PersistentCache("profiles", ttl=PROFILE_CACHE_TTL)
+    return _profile_cache
+
+
+def contributor_login(contributor):
+    """
+    Return the login of a contributor given as a NamedUser, a contributor dict
+    or a plain login string.
+    """
+    if isinstance(contributor, str):
+        return contributor
+    if isinstance(contributor, dict):
+        return contributor.get("login", "Unknown")
+    return getattr(contributor, "login", "Unknown")
+
+
+def get_cached_profiles(logins):
+    """
+    Return the cached, unexpired profiles among `logins`.
+
+    Returns:
+        dict: Mapping of login to contributor dict.
+    """
+    cache = _cache()
+    profiles = {}
+    for login in logins:
+        profile = cache.get(login)
+        if profile is not None:
+            profiles[login] = profile
+    return profiles
+
+
+def store_profiles(profiles):
+    """
+    Write freshly fetched contributor dicts into the profile cache.
+    """
+    cache = _cache()
+    for profile in profiles:
+        if profile.get("login"):
+            cache.set(profile["login"], {f: profile.get(f) for f in PROFILE_FIELDS})
+
+
+def resolve_profiles(logins):
+    """
+    Resolve many logins to contributor dicts, reading through the persistent
+    cache and fetching all uncached logins in batched GraphQL queries.
+
+    Returns:
+        dict: Mapping of login to contributor dict.
+    """
+    logins = [login for login in dict.fromkeys(logins) if login]
+    profiles = get_cached_profiles(logins)
+    missing = [login for login in logins if login not in profiles]
+    logger.debug(f"Profile cache: {len(profiles)} cached, {len(missing)} to fetch")
+
+    if missing:
+        fetched = fetch_user_profiles(missing)
+        store_profiles(fetched.values())
+        profiles.update(fetched)
+    return profiles
+
+
+def resolve_profile(contributor):
+    """
+    Resolve a single contributor (NamedUser, dict or login) to a contributor
+    dict. A dict that already carries profile fields is returned as is.
+    """
+    login = contributor_login(contributor)
+    if isinstance(contributor, dict) and "location" in contributor:
+        return contributor
+    return resolve_profiles([login]).get(login) or {"login": login}
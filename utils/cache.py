@@ -0,0 +1,181 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+import logging
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Directory holding all persistent caches; override with ORIGIN_CACHE_DIR
+CACHE_DIR = os.getenv("ORIGIN_CACHE_DIR", "cache")
+
+
+class PersistentCache:
+    """
+    Thread-safe key/value store backed by a SQLite file in CACHE_DIR.
+
+    Values are stored as JSON. Every record has an optional expiry, and the
+    store can be capped in size, evicting the least recently used records
+    first once the cap is exceeded.
+    """
+
+    def __init__(self, name, ttl=None, max_bytes=None, path=None):
+        """
+        Args:
+            name (str): Cache name, used for the SQLite file name.
+            ttl (float): Default lifetime of a record in seconds (None = forever).
+            max_bytes (int): Optional cap on the total size of stored values.
+            path (str): Optional explicit path of the SQLite file.
+        """
+        self.name = name
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.path = path or os.path.join(CACHE_DIR, f"{name}.sqlite")
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(
+            self.path, check_same_thread=False, timeout=30, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                expires_at REAL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)"
+        )
+        self._total_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+
+    def get_entry(self, key):
+        """
+        Return the stored record for `key`, expired or not.
+
+        Returns:
+            dict or None: {"value", "stored_at", "expires_at", "expired"}.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at, expires_at FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+
+        value, stored_at, expires_at = row
+        expired = expires_at is not None and expires_at <= now
+        if expired:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return {
+            "value": json.loads(value),
+            "stored_at": stored_at,
+            "expires_at": expires_at,
+            "expired": expired,
+        }
+
+    def get(self, key, default=None):
+        """
+        Return the value stored for `key`, or `default` if missing or expired.
+        """
+        entry = self.get_entry(key)
+        if entry is None or entry["expired"]:
+            return default
+        return entry["value"]
+
+    def set(self, key, value, ttl=None):
+        """
+        Store `value` under `key`. `ttl` overrides the cache default lifetime.
+        """
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = now + ttl if ttl is not None else None
+        payload = json.dumps(value, default=str)
+        size = len(payload)
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self._total_bytes -= row[0]
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(key, value, size, stored_at, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, payload, size, now, expires_at, now),
+            )
+            self._total_bytes += size
+            self._evict()
+
+    def touch(self, key, ttl=None):
+        """
+        Mark `key` as freshly validated without rewriting its value.
+        """
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = now + ttl if ttl is not None else None
+        with self._lock:
+            self._conn.execute(
+                "UPDATE entries SET stored_at = ?, expires_at = ?, accessed_at = ? "
+                "WHERE key = ?",
+                (now, expires_at, now, key),
+            )
+
+    def delete(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self._total_bytes -= row[0]
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._total_bytes = 0
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def _evict(self):
+        # Caller holds the lock
+        if self.max_bytes is None or self._total_bytes <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT key, size FROM entries ORDER BY accessed_at ASC"
+        )
+        evicted = []
+        for key, size in rows:
+            if self._total_bytes <= self.max_bytes:
+                break
+            evicted.append((key,))
+            self._total_bytes -= size
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", evicted)
+        logger.debug(f"Evicted {len(evicted)} entries from cache '{self.name}'")
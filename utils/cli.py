@@ -1,7 +1,7 @@
 import cmd
 import readline
 from provenance import adversarial_check, commit, contributor, geography
-from utils.utils import load_country_codes
+from utils.gazetteer import get_gazetteer
 from services.github_client import github_client
 from config.argument_parser import configure_logging  # Import configure_logging
 import logging
@@ -26,6 +26,9 @@ class OriginCLI(cmd.Cmd):
             verbose=False, repo_url=None, adversarial=False
         )
         configure_logging(self.args.verbose)  # Ensure logging is configured
+        self.use_graphql = getattr(self.args, "graphql", False)
+        self.max_workers = getattr(self.args, "workers", 8)
+        self.use_async = getattr(self.args, "use_async", False)
         # Enable tab completion using readline
         readline.set_completer_delims(" \t\n")
         readline.parse_and_bind("tab: complete")
@@ -55,7 +58,7 @@ class OriginCLI(cmd.Cmd):
 
     def provenance_menu(self, run_geography_check=False, run_adversarial=False):
         g = github_client()
-        city_country_dict = load_country_codes("data/country_codes.csv")
+        city_country_dict = get_gazetteer().city_country_dict()
 
         if self.args.repo_url:
             repo_url = self.args.repo_url
@@ -73,6 +76,9 @@ class OriginCLI(cmd.Cmd):
                 repo_name,
                 show_commits=False,
                 city_country_dict=city_country_dict,
+                use_graphql=self.use_graphql,
+                max_workers=self.max_workers,
+                use_async=self.use_async,
             )
             adversarial_check.run_adversarial_analysis(
                 owner, repo_name, contributors, city_country_dict
@@ -87,6 +93,9 @@ class OriginCLI(cmd.Cmd):
                 repo_name,
                 show_commits=False,
                 city_country_dict=city_country_dict,
+                use_graphql=self.use_graphql,
+                max_workers=self.max_workers,
+                use_async=self.use_async,
             )
             for contrib in contributors:
                 geography.identify_geography(contrib, city_country_dict)
@@ -104,7 +113,13 @@ class OriginCLI(cmd.Cmd):
             if choice == "1":
                 print("Analyzing commits...")
                 try:
-                    commit.analyze_commits(owner, repo_name)
+                    commit.analyze_commits(
+                        owner,
+                        repo_name,
+                        use_graphql=self.use_graphql,
+                        use_async=self.use_async,
+                        max_workers=self.max_workers,
+                    )
                 except AttributeError:
                     print(
                         "Error: 'analyze_commits' function not found in commit module."
@@ -117,6 +132,9 @@ class OriginCLI(cmd.Cmd):
                     repo_name,
                     show_commits=False,
                     city_country_dict=city_country_dict,
+                    use_graphql=self.use_graphql,
+                    max_workers=self.max_workers,
+                    use_async=self.use_async,
                 )
             elif choice == "3":
                 print("Running geography check...")
@@ -126,6 +144,9 @@ class OriginCLI(cmd.Cmd):
                     repo_name,
                     show_commits=False,
                     city_country_dict=city_country_dict,
+                    use_graphql=self.use_graphql,
+                    max_workers=self.max_workers,
+                    use_async=self.use_async,
                 )
                 for contrib in contributors:
                     geography.identify_geography(contrib, city_country_dict)
@@ -137,6 +158,9 @@ class OriginCLI(cmd.Cmd):
                     repo_name,
                     show_commits=False,
                     city_country_dict=city_country_dict,
+                    use_graphql=self.use_graphql,
+                    max_workers=self.max_workers,
+                    use_async=self.use_async,
                 )
                 adversarial_check.run_adversarial_analysis(
                     owner, repo_name, contributors, city_country_dict
@@ -199,7 +223,7 @@ class OriginCLI(cmd.Cmd):
                 contributors = contributor.get_contributors(
                     g, owner, repo_name, show_commits=False
                 )
-                city_country_dict = load_country_codes("data/country_codes.csv")
+                city_country_dict = get_gazetteer().city_country_dict()
                 for contrib in contributors:
                     geography.identify_geography(contrib, city_country_dict)
                 adversarial_check.run_adversarial_analysis(
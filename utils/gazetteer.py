@@ -0,0 +1,319 @@
+import os
+import csv
+import hashlib
+import sqlite3
+import threading
+import logging
+from utils.cache import CACHE_DIR
+from utils.utils import load_country_codes
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+COUNTRY_CODES_PATH = "data/country_codes.csv"
+WORLD_CITIES_PATH = "data/world_cities.csv"
+US_CITIES_PATH = "data/us_cities.csv"
+GAZETTEER_PATH = os.path.join(CACHE_DIR, "gazetteer.sqlite")
+
+# Bump when the schema or the ranking changes to force a rebuild
+GAZETTEER_SCHEMA = 2
+
+# US cities this high in us_cities.csv outrank same-named cities elsewhere
+MAJOR_US_CITIES = 500
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE countries (code TEXT NOT NULL, name TEXT NOT NULL);
+CREATE TABLE cities (
+    name_key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    country TEXT NOT NULL,
+    state TEXT,
+    state_code TEXT,
+    rank INTEGER NOT NULL
+);
+CREATE TABLE regions (
+    name_key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    code TEXT,
+    country TEXT NOT NULL
+);
+CREATE INDEX cities_name ON cities (name_key, rank);
+CREATE INDEX regions_name ON regions (name_key);
+"""
+
+
+def source_version(
+    paths=(COUNTRY_CODES_PATH, WORLD_CITIES_PATH, US_CITIES_PATH),
+):
+    """
+    Fingerprint the source data files, so an index built from older data is
+    detected and rebuilt.
+    """
+    digest = hashlib.sha1(str(GAZETTEER_SCHEMA).encode())
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        except FileNotFoundError:
+            digest.update(f"{path}:missing".encode())
+    return digest.hexdigest()
+
+
+def _read_world_cities(file_path):
+    """
+    Yield (city, country, state, geonames id) rows, keeping duplicate names.
+    """
+    try:
+        with open(file_path, newline="", encoding="utf-8") as csvfile:
+            for row in csv.reader(csvfile):
+                if len(row) == 4:
+                    city, country, state, geoname_id = row
+                    yield city, country, state, int(geoname_id or 0)
+    except FileNotFoundError as e:
+        logger.error(f"File not found: {file_path}, Error: {e}")
+
+
+def _read_us_cities(file_path):
+    """
+    Yield (city, state code, state, country) rows of the US city list, which
+    is ordered by population.
+    """
+    try:
+        with open(file_path, newline="", encoding="utf-8") as csvfile:
+            reader = csv.reader(csvfile)
+            next(reader, None)  # Skip header row
+            for row in reader:
+                if len(row) == 4:
+                    yield tuple(row)
+    except FileNotFoundError as e:
+        logger.error(f"File not found: {file_path}, Error: {e}")
+
+
+def build_gazetteer(path=GAZETTEER_PATH):
+    """
+    Compile country_codes.csv, world_cities.csv and us_cities.csv into one
+    SQLite index. The index is written next to `path` and swapped in
+    atomically, so concurrent readers never see a partial file.
+
+    Cities sharing a name are all kept and ranked: regional capitals (city
+    named like its region) first, then the MAJOR_US_CITIES largest US
+    cities, then other cities listed in world_cities.csv, then the remaining
+    US cities by population, ties broken by geonames ID. world_cities.csv
+    carries geonames IDs rather than populations, so the population order
+    of us_cities.csv is the only population signal available.
+    """
+    version = source_version()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    # (name_key, country, state) -> [name, state_code, in_world, geoname_id, us_rank]
+    cities = {}
+    regions = {}
+    for us_rank, (city, state_code, state, country) in enumerate(
+        _read_us_cities(US_CITIES_PATH)
+    ):
+        key = (city.lower(), country, state)
+        cities.setdefault(key, [city, state_code, False, None, us_rank])
+        regions.setdefault((state.lower(), country), (state, state_code))
+    for city, country, state, geoname_id in _read_world_cities(WORLD_CITIES_PATH):
+        key = (city.lower(), country, state)
+        entry = cities.setdefault(key, [city, None, False, None, None])
+        entry[2] = True
+        entry[3] = geoname_id
+        if state:
+            regions.setdefault((state.lower(), country), (state, None))
+
+    unranked = len(cities)
+
+    def prominence(item):
+        (name_key, country, state), (_, _, in_world, geoname_id, us_rank) = item
+        if us_rank is None:
+            # US cities missing from the population-ordered list rank last
+            us_rank = unranked if country == "United States" else MAJOR_US_CITIES
+        return (
+            name_key != (state or "").lower(),
+            us_rank,
+            not in_world,
+            geoname_id if geoname_id is not None else float("inf"),
+        )
+
+    rows = []
+    last_name, rank = None, 0
+    for (name_key, country, state), (name, state_code, *_) in sorted(
+        cities.items(), key=lambda item: (item[0][0], prominence(item))
+    ):
+        rank = rank + 1 if name_key == last_name else 0
+        last_name = name_key
+        rows.append((name_key, name, country, state, state_code, rank))
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(SCHEMA)
+        conn.executemany(
+            "INSERT INTO countries VALUES (?, ?)",
+            load_country_codes(COUNTRY_CODES_PATH).items(),
+        )
+        conn.executemany("INSERT INTO cities VALUES (?, ?, ?, ?, ?, ?)", rows)
+        conn.executemany(
+            "INSERT INTO regions VALUES (?, ?, ?, ?)",
+            (
+                (name_key, name, code, country)
+                for (name_key, country), (name, code) in regions.items()
+            ),
+        )
+        conn.execute("INSERT INTO meta VALUES ('version', ?)", (version,))
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+    logger.debug(f"Built gazetteer index {path} with {len(rows)} cities")
+    return version
+
+
+class Gazetteer:
+    """
+    Read-only view of the compiled gazetteer index, shared by every consumer
+    of the city and country data. The index is built on first use and
+    rebuilt whenever the source CSV files change.
+    """
+
+    def __init__(self, path=GAZETTEER_PATH):
+        self.path = path
+        self._version = None
+        self._conn = None
+        self._country_codes = None
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        with self._lock:
+            if self._conn is None:
+                self._conn = self._open()
+            return self._conn
+
+    def _open(self):
+        expected = source_version()
+        if os.path.exists(self.path):
+            conn = sqlite3.connect(
+                f"file:{self.path}?mode=ro", uri=True, check_same_thread=False
+            )
+            row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row and row[0] == expected:
+                self._version = expected
+                return conn
+            conn.close()
+            logger.debug("Gazetteer index is stale; rebuilding")
+        self._version = build_gazetteer(self.path)
+        return sqlite3.connect(
+            f"file:{self.path}?mode=ro", uri=True, check_same_thread=False
+        )
+
+    @property
+    def version(self):
+        """
+        Source fingerprint of the open index; results derived from the
+        gazetteer can be keyed on it to go stale with the data.
+        """
+        self._connection()
+        return self._version
+
+    def _query(self, sql, params=()):
+        conn = self._connection()
+        with self._lock:
+            return conn.execute(sql, params).fetchall()
+
+    def country_codes(self):
+        """
+        Returns:
+            dict: Country code (uppercased) to country name, as load_country_codes.
+        """
+        if self._country_codes is None:
+            self._country_codes = dict(self._query("SELECT code, name FROM countries"))
+        return self._country_codes
+
+    def lookup_city(self, name, country=None):
+        """
+        Return every city called `name`, most prominent first.
+
+        Returns:
+            list: (name, country, state, state_code) tuples.
+        """
+        sql = "SELECT name, country, state, state_code FROM cities WHERE name_key = ?"
+        params = [name.strip().lower()]
+        if country:
+            sql += " AND country = ?"
+            params.append(country)
+        return self._query(sql + " ORDER BY rank", params)
+
+    def best_city(self, name, country=None):
+        """
+        Return the most prominent city called `name`, or None.
+        """
+        matches = self.lookup_city(name, country)
+        return matches[0] if matches else None
+
+    def lookup_region(self, name):
+        """
+        Return the regions (states, provinces) called `name` or with code `name`.
+
+        Returns:
+            list: (name, code, country) tuples.
+        """
+        key = name.strip().lower()
+        return self._query(
+            "SELECT name, code, country FROM regions WHERE name_key = ? "
+            "UNION SELECT name, code, country FROM regions WHERE lower(code) = ?",
+            (key, key),
+        )
+
+    def iter_cities(self):
+        """
+        Yield (name, country, state, state_code, rank) for every city.
+        """
+        yield from self._query(
+            "SELECT name, country, state, state_code, rank FROM cities"
+        )
+
+    def iter_regions(self):
+        """
+        Yield (name, code, country) for every region.
+        """
+        yield from self._query("SELECT name, code, country FROM regions")
+
+    def city_country_dict(self):
+        """
+        Returns:
+            dict: Lowercased city name to the (country, state) of its most
+            prominent city, as load_world_cities.
+        """
+        return {
+            name_key: (country, state)
+            for name_key, country, state in self._query(
+                "SELECT name_key, country, state FROM cities WHERE rank = 0"
+            )
+        }
+
+
+_gazetteer = None
+_gazetteer_lock = threading.Lock()
+
+
+def get_gazetteer():
+    """
+    Return the process-wide Gazetteer.
+    """
+    global _gazetteer
+    with _gazetteer_lock:
+        if _gazetteer is None:
+            _gazetteer = Gazetteer()
+        return _gazetteer
+
+
+if __name__ == "__main__":
+    # One-time build step: python -m utils.gazetteer
+    logging.basicConfig(level=logging.DEBUG)
+    print(f"Built {GAZETTEER_PATH} (version {build_gazetteer()})")